@@ -6,6 +6,11 @@ derivation and rationale behind every value — read that before changing
 anything, especially UPDATE_RATE_HZ, SPI_SPEED_HZ, or the PWM limits.
 """
 
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+import numpy as np
+
 # ─────────────────────────────────────────────
 # HARDWARE TOPOLOGY
 # ─────────────────────────────────────────────
@@ -29,6 +34,15 @@ MOTORS_PER_PICO: int = NUM_MOTORS // NUM_PICOS   # Derived — do not set manual
 # Do NOT raise this above 170 without first switching to a single xfer2() SPI call.
 UPDATE_RATE_HZ: int   = 125
 LOOP_TIME_MS:  float  = 1000.0 / UPDATE_RATE_HZ   # 8.0 ms — derived, do not edit
+LOOP_TIME_NS:  int    = 1_000_000_000 // UPDATE_RATE_HZ   # 8_000_000 ns — derived, for integer deadlines
+
+# Optional real-time scheduling for the flight process (Linux only).
+# FLIGHT_RT_PRIORITY 0 keeps the default scheduler; 1–99 requests SCHED_FIFO at
+# that priority and locks the process's memory (needs CAP_SYS_NICE or an rtprio
+# limit, e.g. `ulimit -r 99`). FLIGHT_CPU pins the process to one core — ideally
+# one reserved with the isolcpus= kernel argument; None leaves affinity alone.
+FLIGHT_RT_PRIORITY: int = 0
+FLIGHT_CPU: int | None = None
 
 # ─────────────────────────────────────────────
 # PWM SIGNAL RANGE
@@ -54,10 +68,12 @@ MAX_PWM_SLEW_LIMIT: float = 25.0   # µs/ms
 # SIGNAL SYNTHESIS
 # ─────────────────────────────────────────────
 FOURIER_TERMS:        int   = 7     # Harmonics per motor for Fourier synthesis
+MAX_FOURIER_TERMS:    int   = 20    # Upper bound on terms per motor (GUI limit; sizes the parameter buffer)
 BASE_FREQUENCY:       float = 1.0   # Hz — fundamental frequency for periodic signals
 EXPERIMENT_DURATION_S: float = 10.0 # Default run length in seconds (overridable per run)
 SIGNAL_MIN_DEFAULT:   float = 0.0   # Normalized signal lower bound
 SIGNAL_MAX_DEFAULT:   float = 1.0   # Normalized signal upper bound
+WAVETABLE_SIZE:       int   = 4096  # Samples per period for wavetable playback (0 = synthesise every tick)
 
 # ─────────────────────────────────────────────
 # GUI / LOGGING
@@ -68,8 +84,22 @@ LOG_INTERVAL_MS:     int = 100      # CSV log entry interval (ms)
 # ─────────────────────────────────────────────
 # SHARED MEMORY (inter-process, GUI ↔ flight loop)
 # ─────────────────────────────────────────────
+# Struct-of-arrays layout: control line, PWM plane, RPM plane. Each region
+# starts on its own 64-byte cache line so a PWM-only reader or writer never
+# touches RPM data. All values below are derived.
 SHARED_MEM_NAME: str = "aww_control_buffer"
-SHARED_MEM_SIZE: int = NUM_MOTORS * 8   # NUM_MOTORS × float64 (8 bytes each) — derived
+SHM_CACHE_LINE:  int = 64
+SHM_CONTROL_OFFSET: int = 0                      # uint64 frame counter, uint8 stop flag (+ padding)
+SHM_STOP_FLAG_OFFSET: int = SHM_CONTROL_OFFSET + 8
+SHM_CONTROL_BYTES:  int = SHM_CACHE_LINE
+SHM_PWM_OFFSET:     int = SHM_CONTROL_OFFSET + SHM_CONTROL_BYTES
+SHM_PWM_BYTES:      int = -(-NUM_MOTORS * 2 // SHM_CACHE_LINE) * SHM_CACHE_LINE   # int16, padded
+SHM_RPM_OFFSET:     int = SHM_PWM_OFFSET + SHM_PWM_BYTES
+SHM_RPM_BYTES:      int = -(-NUM_MOTORS * 2 // SHM_CACHE_LINE) * SHM_CACHE_LINE   # float16, padded
+SHARED_MEM_SIZE: int = SHM_RPM_OFFSET + SHM_RPM_BYTES   # 64 + 128 + 128 = 320 bytes
+
+# Live signal parameters, GUI → flight loop (seqlock-protected; see ParameterBuffer)
+PARAM_MEM_NAME: str = "aww_param_buffer"
 
 # ─────────────────────────────────────────────
 # SPI BUS CONFIGURATION
@@ -107,42 +137,97 @@ SYNC_PULSE_WIDTH_US: int = 10   # Pulse high duration in µs
 
 SINGLE_MOTOR_TEST: bool = False
 
-FULL_PICO_MOTOR_MAP: dict = {
-    'quadrant_top_left': {
-        'pico_id': 0,
-        'motors': list(range(0, 9)),
-        'pin_offset': 0,
-        'description': 'Top-Left 3x3 Grid'
-    },
-    'quadrant_top_right': {
-        'pico_id': 1,
-        'motors': list(range(9, 18)),
-        'pin_offset': 0,
-        'description': 'Top-Right 3x3 Grid'
-    },
-    'quadrant_bottom_left': {
-        'pico_id': 2,
-        'motors': list(range(18, 27)),
-        'pin_offset': 0,
-        'description': 'Bottom-Left 3x3 Grid'
-    },
-    'quadrant_bottom_right': {
-        'pico_id': 3,
-        'motors': list(range(27, 36)),
-        'pin_offset': 0,
-        'description': 'Bottom-Right 3x3 Grid'
-    }
-}
-
-PICO_MOTOR_MAP: dict = (
-    {
-        'single_motor_test': {
-            'pico_id': 0,
-            'motors': [0],
-            'pin_offset': 0,
-            'description': 'Single Motor Test (Motor 0 on Pico0)'
-        }
-    }
+
+class PicoQuadrant(NamedTuple):
+    """One Pico board's share of the motor array."""
+    pico_id: int
+    motors: tuple        # Logical motor IDs driven by this board, in pin order
+    pin_offset: int      # First GPIO pin used on the board
+    description: str
+
+
+# Read-only views: everything derived below is computed once at import and
+# would silently go stale if the maps could be mutated afterwards.
+FULL_PICO_MOTOR_MAP: Mapping[str, PicoQuadrant] = MappingProxyType({
+    'quadrant_top_left':     PicoQuadrant(0, tuple(range(0, 9)),   0, 'Top-Left 3x3 Grid'),
+    'quadrant_top_right':    PicoQuadrant(1, tuple(range(9, 18)),  0, 'Top-Right 3x3 Grid'),
+    'quadrant_bottom_left':  PicoQuadrant(2, tuple(range(18, 27)), 0, 'Bottom-Left 3x3 Grid'),
+    'quadrant_bottom_right': PicoQuadrant(3, tuple(range(27, 36)), 0, 'Bottom-Right 3x3 Grid'),
+})
+
+PICO_MOTOR_MAP: Mapping[str, PicoQuadrant] = (
+    MappingProxyType({
+        'single_motor_test': PicoQuadrant(0, (0,), 0, 'Single Motor Test (Motor 0 on Pico0)')
+    })
     if SINGLE_MOTOR_TEST
     else FULL_PICO_MOTOR_MAP
 )
+
+
+UNMAPPED: int = 0xFF   # Sentinel in PICO_ID_BY_MOTOR / PIN_BY_MOTOR for unmapped motors
+
+
+def _validate_pico_motor_map(motor_map: Mapping[str, PicoQuadrant], complete: bool) -> None:
+    """
+    Check the wiring map once at import so consumers can trust it without
+    per-call bounds checks.
+
+    Raises ValueError if a pico_id is outside 0..NUM_PICOS-1, a motor ID is
+    outside 0..NUM_MOTORS-1 or appears twice, a pin_offset is negative, a pin
+    does not fit the uint8 arrays, or (complete=True) some motor is not mapped
+    at all.
+    """
+    seen = set()
+    for name, quadrant in motor_map.items():
+        if not 0 <= quadrant.pico_id < NUM_PICOS:
+            raise ValueError(f"{name}: pico_id {quadrant.pico_id} outside 0..{NUM_PICOS - 1}")
+        if quadrant.pin_offset < 0:
+            raise ValueError(f"{name} (Pico {quadrant.pico_id}): pin_offset {quadrant.pin_offset} is negative")
+        if quadrant.pin_offset + len(quadrant.motors) > UNMAPPED:
+            raise ValueError(f"{name}: pin numbers do not fit in uint8")
+        for motor_id in quadrant.motors:
+            if not 0 <= motor_id < NUM_MOTORS:
+                raise ValueError(f"{name}: motor {motor_id} outside 0..{NUM_MOTORS - 1}")
+            if motor_id in seen:
+                raise ValueError(f"{name}: motor {motor_id} is mapped more than once")
+            seen.add(motor_id)
+    if complete and len(seen) != NUM_MOTORS:
+        missing = sorted(set(range(NUM_MOTORS)) - seen)
+        raise ValueError(f"PICO_MOTOR_MAP leaves motors unmapped: {missing}")
+
+
+_validate_pico_motor_map(FULL_PICO_MOTOR_MAP, complete=True)
+_validate_pico_motor_map(PICO_MOTOR_MAP, complete=not SINGLE_MOTOR_TEST)
+
+
+def _build_motor_pico_lookup() -> tuple:
+    """
+    Flatten PICO_MOTOR_MAP into per-motor lookups.
+
+    Returns (lookup, pico_ids, pins):
+        lookup   — tuple indexed by motor_id (0..NUM_MOTORS-1) whose entries are
+                   (pico_id, pin_position); pin_position is the motor's slot on
+                   its Pico shifted by the quadrant's pin_offset. Motors absent
+                   from the map (e.g. SINGLE_MOTOR_TEST mode) map to None.
+        pico_ids — np.uint8[NUM_MOTORS], same data as lookup[m][0] (SoA layout)
+        pins     — np.uint8[NUM_MOTORS], same data as lookup[m][1]
+    Unmapped entries in the arrays hold UNMAPPED.
+    """
+    lookup = [None] * NUM_MOTORS
+    pico_ids = np.full(NUM_MOTORS, UNMAPPED, dtype=np.uint8)
+    pins = np.full(NUM_MOTORS, UNMAPPED, dtype=np.uint8)
+    for quadrant in PICO_MOTOR_MAP.values():
+        for position, motor_id in enumerate(quadrant.motors):
+            pin = quadrant.pin_offset + position
+            lookup[motor_id] = (quadrant.pico_id, pin)
+            pico_ids[motor_id] = quadrant.pico_id
+            pins[motor_id] = pin
+    return tuple(lookup), pico_ids, pins
+
+
+# Indexed by motor_id — a tuple, not a dict, since motor IDs are a dense 0..N-1 range.
+# PICO_ID_BY_MOTOR / PIN_BY_MOTOR hold the same mapping as two contiguous uint8
+# arrays so per-Pico grouping is a single mask or fancy-index gather.
+MOTOR_TO_PICO_LOOKUP, PICO_ID_BY_MOTOR, PIN_BY_MOTOR = _build_motor_pico_lookup()
+PICO_ID_BY_MOTOR.flags.writeable = False
+PIN_BY_MOTOR.flags.writeable = False
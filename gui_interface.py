@@ -5,24 +5,42 @@ Features: Multiple groups, live monitoring, custom Fourier signals.
 """
 
 import sys
+import json
+import platform
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 import numpy as np
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QComboBox, QSpinBox, QDoubleSpinBox,
     QGridLayout, QGroupBox, QMessageBox, QListWidget, QSplitter,
-    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+    QTableView, QHeaderView, QFileDialog,
     QCheckBox
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, pyqtSignal
 from PyQt6.QtGui import QFont, QColor
 import pyqtgraph as pg
 import multiprocessing
-from collections import deque
 
-from config import BASE_FREQUENCY, NUM_MOTORS, PWM_MIN, PWM_MAX
+from config import (
+    BASE_FREQUENCY, NUM_MOTORS, PWM_MIN, PWM_MAX, MAX_FOURIER_TERMS,
+    MAX_PWM_SLEW_LIMIT, UPDATE_RATE_HZ,
+)
 from src.physics.signal_designer import generate_sine_wave, generate_square_pulse, generate_uniform
-from src.core import MotorStateBuffer
+from src.core import MotorStateBuffer, ParameterBuffer, share_ndarray
+from src.core.flight_loop import flight_worker
+from src.hardware.interface import HardwareInterface
+
+# Real SPI/GPIO drivers exist only on the Pi (Linux); elsewhere use the mocks
+USE_MOCK_HARDWARE = platform.system() != "Linux"
+
+# Live plot is a thin 2 px trace redrawn continuously; antialiasing buys nothing.
+pg.setConfigOptions(antialias=False)
 
 
 # Color palette for groups
@@ -35,14 +53,123 @@ GROUP_COLORS = [
     ("#00BCD4", "#006064"),  # Cyan
 ]
 
+# Signal types in signal_type combo order; MotorGroup.signal_kind is the index
+SIGNAL_TYPES = ("Sine Wave", "Square Wave", "Constant DC", "Custom Fourier")
+SIGNAL_SINE, SIGNAL_SQUARE, SIGNAL_DC, SIGNAL_CUSTOM = range(len(SIGNAL_TYPES))
+
+# Control visibility per signal kind: (standard params, DC params, custom params,
+# phase label, standard phase spinbox, DC phase spinbox)
+_SIGNAL_VISIBILITY = (
+    (True, False, False, True, True, False),    # SIGNAL_SINE
+    (True, False, False, True, True, False),    # SIGNAL_SQUARE
+    (False, True, False, True, False, True),    # SIGNAL_DC
+    (False, False, True, False, False, False),  # SIGNAL_CUSTOM
+)
+
+# Distinct group parameter sets whose coefficient matrices are kept for reuse
+_COEFF_CACHE_SIZE = 32
+
+# Live monitor modes in monitor_type combo order
+MONITOR_INDIVIDUAL, MONITOR_GROUP_AVERAGE = 0, 1
+
+# Single stylesheet for the motor grid, parsed once. Each MotorButton carries a
+# "colorIndex" property (group colour index, -1 = unassigned) that selects its
+# rule, so reassigning a motor re-polishes the button without any CSS parsing.
+_UNASSIGNED_INDEX = -1
+_MOTOR_BUTTON_STYLE = """
+                QPushButton[colorIndex="-1"] {
+                    background-color: #cccccc;
+                    color: #666666;
+                    border: 2px solid #999999;
+                    border-radius: 8px;
+                    font-size: 14px;
+                }
+                QPushButton[colorIndex="-1"]:hover {
+                    background-color: #bbbbbb;
+                }
+            """ + "".join(
+    f"""
+                QPushButton[colorIndex="{index}"] {{
+                    background-color: {bg_color};
+                    color: white;
+                    border: 3px solid {border_color};
+                    border-radius: 8px;
+                    font-weight: bold;
+                    font-size: 14px;
+                }}
+                QPushButton[colorIndex="{index}"]:hover {{
+                    border: 3px solid #FFD700;
+                }}
+            """
+    for index, (bg_color, border_color) in enumerate(GROUP_COLORS)
+)
+
+# Status label and arm button variants, swapped as the experiment state changes
+_STATUS_READY_STYLE = """
+            QLabel {
+                background-color: #e3f2fd;
+                padding: 10px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+        """
+_STATUS_RUNNING_STYLE = """
+            QLabel {
+                background-color: #c8e6c9;
+                padding: 10px;
+                border-radius: 5px;
+                font-weight: bold;
+                color: #2e7d32;
+            }
+        """
+_STATUS_STOPPING_STYLE = """
+            QLabel {
+                background-color: #fff9c4;
+                padding: 10px;
+                border-radius: 5px;
+                font-weight: bold;
+                color: #f57f17;
+            }
+        """
+_ARM_BUTTON_STYLE = """
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background-color: #F57C00; }
+        """
+_DISARM_BUTTON_STYLE = """
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background-color: #d32f2f; }
+        """
+
 
 class MotorGroup:
     """Represents a group of motors with shared signal configuration."""
     
+    __slots__ = (
+        'name', 'color_index', 'motors',
+        '_signal_type', 'signal_kind', 'amp_min', 'amp_max', 'dc_value', '_period', 'omega', 'phase_offset',
+        'fourier_terms', '_custom_harmonics',
+        'harmonic_orders', 'harmonic_amps', 'harmonic_phases_rad',
+        '_coeff_cache', '_coeff_key',
+    )
+    
     def __init__(self, name, color_index=0):
         self.name = name
         self.color_index = color_index
-        self.motors = set()  # Set of motor IDs
+        self.motors = np.zeros(NUM_MOTORS, dtype=bool)  # Membership mask indexed by motor ID
         
         # Signal configuration
         self.signal_type = "Sine Wave"
@@ -55,12 +182,146 @@ class MotorGroup:
         
         # Custom Fourier harmonics: [(harmonic_num, amplitude, phase_deg), ...]
         self.custom_harmonics = []
+        
+        # (coeffs, phases) from generate_group_coefficients and the parameter
+        # key they were built from; reused while the key is unchanged
+        self._coeff_cache = None
+        self._coeff_key = None
+    
+    def coefficient_key(self):
+        """Tuple of every parameter the group's coefficient matrices depend on."""
+        return (self.signal_kind, self.amp_min, self.amp_max, self.dc_value,
+                self.fourier_terms, tuple(self._custom_harmonics))
+    
+    @property
+    def signal_type(self):
+        return self._signal_type
+    
+    @signal_type.setter
+    def signal_type(self, signal_type):
+        """Store the signal type name and its SIGNAL_* index."""
+        self._signal_type = signal_type
+        self.signal_kind = SIGNAL_TYPES.index(signal_type)
+    
+    @property
+    def period(self):
+        return self._period
+    
+    @period.setter
+    def period(self, period):
+        """Store the period and its angular frequency (BASE_FREQUENCY if period <= 0)."""
+        self._period = period
+        self.omega = 2.0 * np.pi * (1.0 / period if period > 0 else BASE_FREQUENCY)
+    
+    @property
+    def custom_harmonics(self):
+        return self._custom_harmonics
+    
+    @custom_harmonics.setter
+    def custom_harmonics(self, harmonics):
+        """Store the harmonic list together with its stacked array form."""
+        self._custom_harmonics = [tuple(h) for h in harmonics]
+        table = np.array(self._custom_harmonics, dtype=float).reshape(-1, 3)
+        self.harmonic_orders = table[:, 0].astype(np.intp)
+        self.harmonic_amps = table[:, 1]
+        self.harmonic_phases_rad = np.deg2rad(table[:, 2])
     
     def get_color(self):
         """Get the color tuple for this group."""
         return GROUP_COLORS[self.color_index % len(GROUP_COLORS)]
 
 
+@contextmanager
+def _silent(*widgets):
+    """Block Qt signals on every widget for the duration of the block."""
+    for widget in widgets:
+        widget.blockSignals(True)
+    try:
+        yield
+    finally:
+        # Always unblock signals, even if an exception occurs
+        for widget in widgets:
+            widget.blockSignals(False)
+
+
+class HarmonicsModel(QAbstractTableModel):
+    """Editable (harmonic #, amplitude, phase °) rows for the custom Fourier table."""
+    
+    HEADERS = ("#", "Amplitude", "Phase (°)")
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._n = np.zeros(0, dtype=np.intp)
+        self._a = np.zeros(0)
+        self._p = np.zeros(0)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._n)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 3
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        column = (self._n, self._a, self._p)[index.column()]
+        return str(column[index.row()].item())
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        col = index.column()
+        try:
+            if col == 0:
+                self._n[index.row()] = int(value)
+            else:
+                (self._a, self._p)[col - 1][index.row()] = float(value)
+        except (ValueError, TypeError):
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+    
+    def flags(self, index):
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsEditable)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def set_harmonics(self, harmonics):
+        """Replace every row in one model reset."""
+        table = np.array(harmonics, dtype=float).reshape(-1, 3)
+        self.beginResetModel()
+        self._n = table[:, 0].astype(np.intp)
+        self._a = table[:, 1].copy()
+        self._p = table[:, 2].copy()
+        self.endResetModel()
+    
+    def harmonics(self):
+        """Rows as [(harmonic_num, amplitude, phase_deg), ...]."""
+        return list(zip(self._n.tolist(), self._a.tolist(), self._p.tolist()))
+    
+    def append_row(self, harmonic_num, amplitude, phase_deg):
+        row = len(self._n)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._n = np.append(self._n, harmonic_num)
+        self._a = np.append(self._a, amplitude)
+        self._p = np.append(self._p, phase_deg)
+        self.endInsertRows()
+    
+    def remove_row(self, row):
+        """Drop one row and renumber the harmonics 1..N."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._n = np.arange(1, len(self._n), dtype=np.intp)
+        self._a = np.delete(self._a, row)
+        self._p = np.delete(self._p, row)
+        self.endRemoveRows()
+        if len(self._n):
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._n) - 1, 0))
+
+
 class MotorButton(QPushButton):
     """Custom button for motor selection with group support."""
 
@@ -68,10 +329,9 @@ class MotorButton(QPushButton):
         super().__init__(str(motor_id))
         self.motor_id = motor_id
         self.parent_gui = parent_gui
-        self.assigned_group = None
-        self.setMinimumSize(60, 60)
-        self.setMaximumSize(60, 60)
-        self.update_style()
+        self.setFixedSize(60, 60)
+        self._color_index = _UNASSIGNED_INDEX
+        self.setProperty("colorIndex", _UNASSIGNED_INDEX)
         self.clicked.connect(self.on_click)
 
     def on_click(self):
@@ -79,80 +339,112 @@ class MotorButton(QPushButton):
         if self.parent_gui.experiment_running:
             return
 
-        selected_group = self.parent_gui.get_selected_group()
+        gui = self.parent_gui
+        selected_group = gui.get_selected_group()
         if selected_group:
-            if self.assigned_group == selected_group:
+            selected_id = gui.selected_group_index
+            current_id = self.group_id
+            if current_id == selected_id:
                 # Unassign if already in this group
-                selected_group.motors.discard(self.motor_id)
-                self.assigned_group = None
+                selected_group.motors[self.motor_id] = False
+                gui.button_group_ids[self.motor_id] = -1
+                gui.motorAssignmentChanged.emit(-1)
             else:
                 # Remove from old group if assigned
-                if self.assigned_group:
-                    self.assigned_group.motors.discard(self.motor_id)
+                if current_id >= 0:
+                    gui.groups[current_id].motors[self.motor_id] = False
+                else:
+                    gui.motorAssignmentChanged.emit(1)
                 # Assign to new group
-                selected_group.motors.add(self.motor_id)
-                self.assigned_group = selected_group
+                selected_group.motors[self.motor_id] = True
+                gui.button_group_ids[self.motor_id] = selected_id
             self.update_style()
 
+    @property
+    def group_id(self):
+        """Index of the group this motor belongs to, or -1 if unassigned."""
+        return int(self.parent_gui.button_group_ids[self.motor_id])
+
     def update_style(self):
         """Update button appearance based on group assignment."""
-        if self.assigned_group:
-            bg_color, border_color = self.assigned_group.get_color()
-            self.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {bg_color};
-                    color: white;
-                    border: 3px solid {border_color};
-                    border-radius: 8px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    border: 3px solid #FFD700;
-                }}
-            """)
+        group_id = self.group_id
+        if group_id >= 0:
+            color_index = self.parent_gui.groups[group_id].color_index % len(GROUP_COLORS)
         else:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #cccccc;
-                    color: #666666;
-                    border: 2px solid #999999;
-                    border-radius: 8px;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background-color: #bbbbbb;
-                }
-            """)
+            color_index = _UNASSIGNED_INDEX
+        if color_index == self._color_index:
+            return
+        self._color_index = color_index
+        self.setProperty("colorIndex", color_index)
+        # Re-match the grid stylesheet against the new property value
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
 
 
 class WindWallGUI(QMainWindow):
     """Main GUI window for Active Wind Wall control."""
     
+    # Change in the number of assigned motors (+1 / -1), emitted by MotorButton
+    motorAssignmentChanged = pyqtSignal(int)
+    # Emitted by the experiment thread when a run ends; delivered queued to the GUI thread
+    experimentFinished = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.groups = []
         self.selected_group_index = -1
+        self._selected_group = None  # groups[selected_group_index] or None
         self.motor_buttons = []
+        # Group index per motor (-1 = unassigned); the single source of truth
+        # for MotorButton.group_id, mirrored by each group's motors mask
+        self.button_group_ids = np.full(NUM_MOTORS, -1, dtype=np.int8)
+        self.active_motor_count = 0  # motors assigned to any group, kept incrementally
+        # coefficient_key() -> (coeffs, phases), shared by every group (LRU order);
+        # consulted only after a group's own _coeff_cache slot misses
+        self._shared_coeff_lru = OrderedDict()
+        # Last combined (coeffs, omega, phases) and the group state it was built from
+        self._fourier_cache = None
+        self._fourier_key = None
         self.experiment_running = False
         self.is_armed = False
+        # Long-lived flight worker process, started on the first experiment
         self.flight_process = None
+        self.flight_commands = None
+        self.flight_done = None
         self.stop_event = None
+        self.experiment_thread = None
         self.shared_buffer = None
-        self.param_queue = None
+        self.param_buffer = None
         self.heartbeat_stop_event = None
         self.heartbeat_thread = None
         # Direct signal mode state
         self.direct_signal_table = None   # np.ndarray [n_frames, n_motors] or None
         self.direct_signal_rate_hz = None # sample rate of the loaded table
         
-        # Live monitoring - oscilloscope style
-        self.monitor_data_time = deque(maxlen=200)  # 5 seconds at 40Hz
-        self.monitor_data_pwm = deque(maxlen=200)
+        # Live monitoring - oscilloscope style, preallocated ring buffer.
+        # Each buffer is two copies of the ring back to back (every sample is
+        # written at head and head + capacity), so the window is always one
+        # contiguous slice and can go to pyqtgraph without copying.
+        self.monitor_capacity = 200  # 5 seconds at 40Hz
+        self.monitor_buf_time = np.empty(2 * self.monitor_capacity)
+        self.monitor_buf_pwm = np.empty(2 * self.monitor_capacity)
+        self.monitor_pwm = np.empty(NUM_MOTORS, dtype=np.int16)  # per-tick PWM snapshot
+        self.monitor_head = 0    # next write position
+        self.monitor_count = 0   # valid samples (<= monitor_capacity)
         self.monitor_timer = None
+        self.monitor_mode = MONITOR_INDIVIDUAL
+        # Plot repaints are coalesced onto their own slower timer (20 Hz cap);
+        # the sampling tick only marks the plot dirty.
+        self._plot_dirty = False
+        self._plot_time = 0.0
+        self._render_timer = QTimer()
+        self._render_timer.timeout.connect(self._flush_plot)
         self.experiment_start_time = None  # Set when experiment starts - never resets
         
         self.init_ui()
+        self.motorAssignmentChanged.connect(self.adjust_active_count)
+        self.experimentFinished.connect(self.experiment_finished)
         
         # Create default group after UI is initialized
         self.add_group("Group 1")
@@ -173,6 +465,12 @@ class WindWallGUI(QMainWindow):
         # Left panel - Groups and signal configuration
         left_panel = self.create_left_panel()
         top_splitter.addWidget(left_panel)
+        # Per-group controls, silenced together while a group is loaded
+        self._group_widgets = (
+            self.signal_type, self.amp_min, self.amp_max, self.dc_value_spinbox,
+            self.period, self.phase_offset_for_standard, self.phase_offset_spinbox,
+            self.fourier_terms,
+        )
         
         # Center panel - Motor grid
         grid_panel = self.create_grid_panel()
@@ -253,7 +551,7 @@ class WindWallGUI(QMainWindow):
 
         fourier_cfg_layout.addWidget(QLabel("Signal Type:"))
         self.signal_type = QComboBox()
-        self.signal_type.addItems(["Sine Wave", "Square Wave", "Constant DC", "Custom Fourier"])
+        self.signal_type.addItems(SIGNAL_TYPES)
         self.signal_type.currentTextChanged.connect(self.on_signal_type_changed)
         fourier_cfg_layout.addWidget(self.signal_type)
         
@@ -291,7 +589,7 @@ class WindWallGUI(QMainWindow):
         
         standard_layout.addWidget(QLabel("Fourier Terms:"))
         self.fourier_terms = QSpinBox()
-        self.fourier_terms.setRange(1, 20)
+        self.fourier_terms.setRange(1, MAX_FOURIER_TERMS)
         self.fourier_terms.setValue(7)
         self.fourier_terms.valueChanged.connect(self.on_param_changed)
         standard_layout.addWidget(self.fourier_terms)
@@ -345,9 +643,11 @@ class WindWallGUI(QMainWindow):
         custom_layout.setContentsMargins(0, 0, 0, 0)
         
         custom_layout.addWidget(QLabel("Harmonics:"))
-        self.harmonics_table = QTableWidget()
-        self.harmonics_table.setColumnCount(3)
-        self.harmonics_table.setHorizontalHeaderLabels(["#", "Amplitude", "Phase (°)"])
+        self.harmonics_model = HarmonicsModel(self)
+        self.harmonics_model.dataChanged.connect(self.save_custom_harmonics)
+        self.harmonics_table = QTableView()
+        self.harmonics_table.setModel(self.harmonics_model)
+        self.harmonics_table.verticalHeader().hide()
         self.harmonics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.harmonics_table.setMaximumHeight(150)
         custom_layout.addWidget(self.harmonics_table)
@@ -400,6 +700,7 @@ class WindWallGUI(QMainWindow):
     def create_grid_panel(self):
         """Create motor grid panel."""
         group = QGroupBox("Motor Grid (6×6)")
+        group.setStyleSheet(_MOTOR_BUTTON_STYLE)
         layout = QVBoxLayout()
         
         info_label = QLabel("Click motors to assign to selected group")
@@ -410,14 +711,16 @@ class WindWallGUI(QMainWindow):
         grid = QGridLayout()
         grid.setSpacing(5)
         
-        for i in range(36):
-            row = i // 6
-            col = i % 6
-            btn = MotorButton(i, self)
-            self.motor_buttons.append(btn)
-            grid.addWidget(btn, row, col)
+        # Build every button first, then lay them out in one pass with
+        # repaints suspended so Qt restyles/relayouts the grid once.
+        group.setUpdatesEnabled(False)
+        buttons = [MotorButton(i, self) for i in range(NUM_MOTORS)]
+        for i, btn in enumerate(buttons):
+            grid.addWidget(btn, i // 6, i % 6)
+        self.motor_buttons.extend(buttons)
         
         layout.addLayout(grid)
+        group.setUpdatesEnabled(True)
         
         # Selection controls
         btn_layout = QHBoxLayout()
@@ -450,14 +753,7 @@ class WindWallGUI(QMainWindow):
         
         layout.addWidget(QLabel("Status:"))
         self.status_label = QLabel("Ready")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                background-color: #e3f2fd;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-        """)
+        self.status_label.setStyleSheet(_STATUS_READY_STYLE)
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_label)
         
@@ -497,17 +793,7 @@ class WindWallGUI(QMainWindow):
 
         self.arm_btn = QPushButton("Arm Motors")
         self.arm_btn.setMinimumHeight(45)
-        self.arm_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF9800;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #F57C00; }
-        """)
+        self.arm_btn.setStyleSheet(_ARM_BUTTON_STYLE)
         self.arm_btn.clicked.connect(self.toggle_arm)
         layout.addWidget(self.arm_btn)
 
@@ -561,11 +847,6 @@ class WindWallGUI(QMainWindow):
         
         group.setLayout(layout)
         
-        # Timer to update active count
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_active_count)
-        self.update_timer.start(500)
-        
         return group
     
     def create_monitor_panel(self):
@@ -578,8 +859,8 @@ class WindWallGUI(QMainWindow):
         control_layout.addWidget(QLabel("Monitor:"))
         
         self.monitor_type = QComboBox()
-        self.monitor_type.addItem("Individual Motor")
-        self.monitor_type.addItem("Group Average")
+        self.monitor_type.addItem("Individual Motor")   # MONITOR_INDIVIDUAL
+        self.monitor_type.addItem("Group Average")      # MONITOR_GROUP_AVERAGE
         self.monitor_type.currentTextChanged.connect(self.on_monitor_type_changed)
         control_layout.addWidget(self.monitor_type)
         
@@ -602,10 +883,15 @@ class WindWallGUI(QMainWindow):
         self.plot_widget.setBackground('w')
         self.plot_widget.setLabel('left', 'PWM Value', units='μs')
         self.plot_widget.setLabel('bottom', 'Time', units='s')
+        self.plot_widget.setXRange(0, 5)
         self.plot_widget.setYRange(900, 2100)
         self.plot_widget.disableAutoRange()
+        self.plot_widget.setMouseEnabled(x=False, y=False)
         self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
-        self.plot_curve = self.plot_widget.plot(pen=pg.mkPen(color='b', width=2))
+        # Samples come from the ring buffer and are always finite and contiguous,
+        # so skip pyqtgraph's per-redraw NaN scan and connectivity detection
+        self.plot_curve = self.plot_widget.plot(pen=pg.mkPen(color='b', width=2),
+                                                connect='all', skipFiniteCheck=True)
         layout.addWidget(self.plot_widget)
         
         group.setLayout(layout)
@@ -630,15 +916,21 @@ class WindWallGUI(QMainWindow):
     def delete_group_clicked(self):
         """Handle delete group button click."""
         if self.selected_group_index >= 0 and len(self.groups) > 1:
-            group = self.groups[self.selected_group_index]
-            # Unassign motors from this group
-            for btn in self.motor_buttons:
-                if btn.assigned_group == group:
-                    btn.assigned_group = None
-                    btn.update_style()
+            index = self.selected_group_index
+            # Unassign motors from this group and shift later group indices down
+            ids = self.button_group_ids
+            removed = ids == index
+            ids[removed] = -1
+            ids[ids > index] -= 1
+            self.adjust_active_count(-int(np.count_nonzero(removed)))
             # Remove group
-            self.groups.pop(self.selected_group_index)
-            self.groups_list.takeItem(self.selected_group_index)
+            self.groups.pop(index)
+            for motor_id in np.flatnonzero(removed):
+                self.motor_buttons[motor_id].update_style()
+            self.groups_list.takeItem(index)
+            # The list may move its current row before the removal shifts rows
+            # up, so the last selection signal can name a stale index; resync
+            self.on_group_selected(self.groups_list.currentRow())
             self.update_monitor_group_list()
         elif len(self.groups) == 1:
             QMessageBox.warning(self, "Cannot Delete", "At least one group must exist!")
@@ -646,6 +938,7 @@ class WindWallGUI(QMainWindow):
     def on_group_selected(self, index):
         """Handle group selection change."""
         self.selected_group_index = index
+        self._update_selected_group()
         if index >= 0 and index < len(self.groups):
             group = self.groups[index]
             self.selected_group_label.setText(f"Selected: {group.name}")
@@ -654,16 +947,7 @@ class WindWallGUI(QMainWindow):
             
             # Block signals while loading group parameters to prevent on_param_changed
             # from being triggered with partially-updated spinbox values
-            self.signal_type.blockSignals(True)
-            self.amp_min.blockSignals(True)
-            self.amp_max.blockSignals(True)
-            self.dc_value_spinbox.blockSignals(True)
-            self.period.blockSignals(True)
-            self.phase_offset_for_standard.blockSignals(True)
-            self.phase_offset_spinbox.blockSignals(True)
-            self.fourier_terms.blockSignals(True)
-            
-            try:
+            with _silent(*self._group_widgets):
                 # Load group's signal configuration
                 self.signal_type.setCurrentText(group.signal_type)
                 self.amp_min.setValue(group.amp_min)
@@ -674,16 +958,6 @@ class WindWallGUI(QMainWindow):
                 self.phase_offset_spinbox.setValue(group.phase_offset)
                 self.fourier_terms.setValue(group.fourier_terms)
                 self.load_custom_harmonics(group)
-            finally:
-                # Always unblock signals, even if an exception occurs
-                self.signal_type.blockSignals(False)
-                self.amp_min.blockSignals(False)
-                self.amp_max.blockSignals(False)
-                self.dc_value_spinbox.blockSignals(False)
-                self.period.blockSignals(False)
-                self.phase_offset_for_standard.blockSignals(False)
-                self.phase_offset_spinbox.blockSignals(False)
-                self.fourier_terms.blockSignals(False)
     
     def on_signal_mode_changed(self, mode):
         """Toggle between Fourier per-group mode and Direct file mode."""
@@ -693,7 +967,6 @@ class WindWallGUI(QMainWindow):
 
     def load_direct_signal_file(self):
         """Open a file dialog to load a direct signal table (.npy or .csv)."""
-        from config import UPDATE_RATE_HZ
         path, _ = QFileDialog.getOpenFileName(
             self, "Load Signal File", "",
             "Signal files (*.npy *.csv);;All files (*)"
@@ -708,7 +981,6 @@ class WindWallGUI(QMainWindow):
             if table.ndim != 2:
                 raise ValueError(f"Expected 2-D array [frames × motors], got shape {table.shape}")
             n_frames, n_motors_in_file = table.shape
-            from config import NUM_MOTORS
             if n_motors_in_file != NUM_MOTORS:
                 reply = QMessageBox.warning(
                     self, "Shape mismatch",
@@ -732,32 +1004,28 @@ class WindWallGUI(QMainWindow):
 
     def on_signal_type_changed(self, signal_type):
         """Handle signal type change - show/hide controls dynamically."""
-        is_sine = signal_type == "Sine Wave"
-        is_square = signal_type == "Square Wave"
-        is_custom = signal_type == "Custom Fourier"
-        is_constant = signal_type == "Constant DC"
-        
-        # Show standard params for sine/square (hide for constant/custom)
-        self.standard_params_widget.setVisible(is_sine or is_square)
-        
-        # Show DC params only for constant
-        self.dc_params_widget.setVisible(is_constant)
-        
-        # Show custom params only for custom
-        self.custom_params_widget.setVisible(is_custom)
+        visibility = _SIGNAL_VISIBILITY[SIGNAL_TYPES.index(signal_type)]
+        widgets = (self.standard_params_widget, self.dc_params_widget,
+                   self.custom_params_widget, self.phase_offset_label,
+                   self.phase_offset_for_standard, self.phase_offset_spinbox)
         
-        # Show phase offset for sine, square, and constant
-        self.phase_offset_label.setVisible(is_sine or is_square or is_constant)
-        self.phase_offset_for_standard.setVisible(is_sine or is_square)
-        self.phase_offset_spinbox.setVisible(is_constant)
+        # One relayout for the whole panel rather than one per widget
+        self.setUpdatesEnabled(False)
+        try:
+            for widget, visible in zip(widgets, visibility):
+                widget.setVisible(visible)
+        finally:
+            self.setUpdatesEnabled(True)
         
         if self.selected_group_index >= 0:
-            self.groups[self.selected_group_index].signal_type = signal_type
+            group = self.groups[self.selected_group_index]
+            group.signal_type = signal_type
     
     def on_dc_value_changed(self):
         """Handle DC value change."""
         if self.selected_group_index >= 0:
-            self.groups[self.selected_group_index].dc_value = self.dc_value_spinbox.value()
+            group = self.groups[self.selected_group_index]
+            group.dc_value = self.dc_value_spinbox.value()
     
     def on_param_changed(self):
         """Handle parameter change."""
@@ -775,76 +1043,51 @@ class WindWallGUI(QMainWindow):
     
     def on_apply_group_live(self):
         """Push current group parameters to the running flight_loop without restarting."""
-        if not self.experiment_running or self.param_queue is None:
+        if not self.experiment_running:
             return
         if self.signal_mode.currentText() == "Direct (file)":
             return
-        active_count = sum(1 for btn in self.motor_buttons if btn.assigned_group is not None)
-        if active_count == 0:
+        if self.active_motor_count == 0:
             return
 
         coeffs, omega_per_motor, phase_radians = self.generate_fourier_coefficients()
 
-        active_groups = [g for g in self.groups if len(g.motors) > 0]
+        active_groups = [g for g in self.groups if g.motors.any()]
         value_max = max(
-            g.dc_value if g.signal_type == "Constant DC" else g.amp_max
+            g.dc_value if g.signal_kind == SIGNAL_DC else g.amp_max
             for g in active_groups
         ) if active_groups else 1.0
 
-        self.param_queue.put({
-            'coeffs': coeffs,
-            'omega_per_motor': omega_per_motor,
-            'phases': phase_radians,
-            'value_max': float(value_max),
-        })
+        self.param_buffer.publish(coeffs, omega_per_motor, phase_radians, float(value_max))
         print(f"[GUI] Applied group parameters live")
 
     def add_harmonic(self):
         """Add a new harmonic to custom Fourier."""
-        row = self.harmonics_table.rowCount()
-        self.harmonics_table.insertRow(row)
-        self.harmonics_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-        self.harmonics_table.setItem(row, 1, QTableWidgetItem("0.1"))
-        self.harmonics_table.setItem(row, 2, QTableWidgetItem("0"))
+        model = self.harmonics_model
+        model.append_row(model.rowCount() + 1, 0.1, 0.0)
         self.save_custom_harmonics()
     
     def remove_harmonic(self):
         """Remove selected harmonic."""
-        current_row = self.harmonics_table.currentRow()
+        current_row = self.harmonics_table.currentIndex().row()
         if current_row >= 0:
-            self.harmonics_table.removeRow(current_row)
-            # Renumber harmonics
-            for i in range(self.harmonics_table.rowCount()):
-                self.harmonics_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
+            self.harmonics_model.remove_row(current_row)  # also renumbers 1..N
             self.save_custom_harmonics()
     
     def load_custom_harmonics(self, group):
         """Load custom harmonics from group."""
-        self.harmonics_table.setRowCount(0)
-        for harmonic_num, amplitude, phase_deg in group.custom_harmonics:
-            row = self.harmonics_table.rowCount()
-            self.harmonics_table.insertRow(row)
-            self.harmonics_table.setItem(row, 0, QTableWidgetItem(str(harmonic_num)))
-            self.harmonics_table.setItem(row, 1, QTableWidgetItem(str(amplitude)))
-            self.harmonics_table.setItem(row, 2, QTableWidgetItem(str(phase_deg)))
+        self.harmonics_model.set_harmonics(group.custom_harmonics)
     
     def save_custom_harmonics(self):
         """Save custom harmonics to current group."""
         if self.selected_group_index >= 0:
             group = self.groups[self.selected_group_index]
-            group.custom_harmonics = []
-            for i in range(self.harmonics_table.rowCount()):
-                try:
-                    harmonic_num = int(self.harmonics_table.item(i, 0).text())
-                    amplitude = float(self.harmonics_table.item(i, 1).text())
-                    phase_deg = float(self.harmonics_table.item(i, 2).text())
-                    group.custom_harmonics.append((harmonic_num, amplitude, phase_deg))
-                except (ValueError, AttributeError):
-                    pass
+            group.custom_harmonics = self.harmonics_model.harmonics()
     
     def on_monitor_type_changed(self, monitor_type):
         """Handle monitor type change."""
-        if monitor_type == "Individual Motor":
+        self.monitor_mode = self.monitor_type.currentIndex()
+        if self.monitor_mode == MONITOR_INDIVIDUAL:
             self.monitor_motor_select.show()
             self.monitor_group_select.hide()
         else:
@@ -859,54 +1102,120 @@ class WindWallGUI(QMainWindow):
     
     def clear_monitor_data(self):
         """Clear monitoring display data (don't reset experiment_start_time)."""
-        self.monitor_data_time.clear()
-        self.monitor_data_pwm.clear()
+        self.monitor_head = 0
+        self.monitor_count = 0
         # NOTE: experiment_start_time persists across selections - it's the reference point!
+        self._plot_dirty = False
         self.plot_curve.setData([], [])
     
+    def push_monitor_sample(self, t, pwm):
+        """Append one sample to the monitor ring buffer, overwriting the oldest."""
+        head = self.monitor_head
+        mirror = head + self.monitor_capacity
+        self.monitor_buf_time[head] = self.monitor_buf_time[mirror] = t
+        self.monitor_buf_pwm[head] = self.monitor_buf_pwm[mirror] = pwm
+        self.monitor_head = (head + 1) % self.monitor_capacity
+        if self.monitor_count < self.monitor_capacity:
+            self.monitor_count += 1
+    
+    def monitor_samples(self):
+        """Return (time, pwm) views of the buffered samples, oldest first."""
+        n = self.monitor_count
+        if n < self.monitor_capacity:
+            return self.monitor_buf_time[:n], self.monitor_buf_pwm[:n]
+        window = slice(self.monitor_head, self.monitor_head + n)
+        return self.monitor_buf_time[window], self.monitor_buf_pwm[window]
+    
     def update_monitor_group_list(self):
         """Update the monitor group dropdown."""
         self.monitor_group_select.clear()
         for group in self.groups:
             self.monitor_group_select.addItem(group.name)
     
+    def _update_selected_group(self):
+        """Re-resolve the cached selected group from selected_group_index."""
+        index = self.selected_group_index
+        self._selected_group = self.groups[index] if 0 <= index < len(self.groups) else None
+    
     def get_selected_group(self):
         """Get the currently selected group."""
-        if 0 <= self.selected_group_index < len(self.groups):
-            return self.groups[self.selected_group_index]
-        return None
+        return self._selected_group
     
     def select_all_motors(self):
         """Assign all motors to the currently selected group."""
         selected_group = self.get_selected_group()
         if selected_group:
-            for btn in self.motor_buttons:
-                # Remove from old group if assigned
-                if btn.assigned_group and btn.assigned_group != selected_group:
-                    btn.assigned_group.motors.discard(btn.motor_id)
-                # Assign to selected group
-                selected_group.motors.add(btn.motor_id)
-                btn.assigned_group = selected_group
-                btn.update_style()
+            # Every motor moves to the selected group
+            for group in self.groups:
+                group.motors[:] = group is selected_group
+            self.button_group_ids[:] = self.selected_group_index
+            self.setUpdatesEnabled(False)  # one repaint for the whole grid
+            try:
+                for btn in self.motor_buttons:
+                    btn.update_style()
+            finally:
+                self.setUpdatesEnabled(True)
+            self.set_active_count(NUM_MOTORS)
         else:
             QMessageBox.warning(self, "No Group Selected", "Please select a group first!")
     
     def clear_all_motors(self):
         """Clear all motor assignments."""
-        for btn in self.motor_buttons:
-            if btn.assigned_group:
-                btn.assigned_group.motors.discard(btn.motor_id)
-            btn.assigned_group = None
-            btn.update_style()
+        for group in self.groups:
+            group.motors[:] = False
+        self.button_group_ids[:] = -1
+        self.setUpdatesEnabled(False)  # one repaint for the whole grid
+        try:
+            for btn in self.motor_buttons:
+                btn.update_style()
+        finally:
+            self.setUpdatesEnabled(True)
+        self.set_active_count(0)
     
-    def update_active_count(self):
-        """Update the count of active motors."""
-        count = sum(1 for btn in self.motor_buttons if btn.assigned_group is not None)
+    def set_active_count(self, count):
+        """Set the number of assigned motors and refresh its label."""
+        self.active_motor_count = count
         self.active_count_label.setText(f"Active Motors: {count}")
     
+    def adjust_active_count(self, delta):
+        """Apply an incremental change to the assigned-motor count."""
+        self.set_active_count(self.active_motor_count + delta)
+    
+    def update_active_count(self):
+        """Recount assigned motors from the group masks (after bulk changes)."""
+        self.set_active_count(int(np.count_nonzero(self.button_group_ids >= 0)))
+    
     def generate_group_coefficients(self, group):
-        """Generate Fourier coefficients for a specific group."""
-        signal_type = group.signal_type
+        """
+        Generate Fourier coefficients for a specific group.
+        
+        Returns the group's cached (read-only) arrays while its
+        coefficient_key() matches the one they were built from.  Otherwise
+        the arrays come from a GUI-wide LRU cache, so groups with identical
+        parameters (or a group switched back to earlier settings) reuse them.
+        """
+        # Per-group slot first, then the GUI-wide LRU, then a fresh build
+        key = group.coefficient_key()
+        if key == group._coeff_key:
+            return group._coeff_cache
+        cache = self._shared_coeff_lru
+        matrices = cache.get(key)
+        if matrices is None:
+            coeffs, phases = self._compute_group_coefficients(group)
+            coeffs.flags.writeable = False
+            phases.flags.writeable = False
+            matrices = cache[key] = (coeffs, phases)
+            if len(cache) > _COEFF_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        group._coeff_cache = matrices
+        group._coeff_key = key
+        return matrices
+    
+    def _compute_group_coefficients(self, group):
+        """Build (coeffs, phases) for a group from its current signal parameters."""
+        signal_kind = group.signal_kind
         amp_min = group.amp_min
         amp_max = group.amp_max
         dc_value = group.dc_value
@@ -918,15 +1227,21 @@ class WindWallGUI(QMainWindow):
         # This ensures the signal reconstruction uses the correct frequency
         base_freq = 1.0 / period if period > 0 else BASE_FREQUENCY
         
-        if signal_type == "Custom Fourier":
+        if signal_kind == SIGNAL_CUSTOM:
             coeffs = np.zeros((NUM_MOTORS, n_terms))
             phases = np.zeros((NUM_MOTORS, n_terms))
-            for harmonic_num, amplitude, phase_deg in group.custom_harmonics:
-                if 0 <= harmonic_num < n_terms:
-                    coeffs[:, harmonic_num] = amplitude
-                    phases[:, harmonic_num] = np.deg2rad(phase_deg)
+            orders = group.harmonic_orders
+            valid = (orders >= 0) & (orders < n_terms)
+            coeffs[:, orders[valid]] = group.harmonic_amps[valid]
+            phases[:, orders[valid]] = group.harmonic_phases_rad[valid]
             return coeffs, phases
         
+        if signal_kind == SIGNAL_DC:
+            # Constant output is just the DC column; none of the swing/trough
+            # handling below applies
+            coeffs = generate_uniform(n_motors=NUM_MOTORS, value=dc_value, n_terms=n_terms)
+            return coeffs, np.zeros((NUM_MOTORS, n_terms))
+        
         # Signal is encoded with absolute speed values: trough = amp_min, peak = amp_max.
         # The flight loop does: pwm = PWM_MIN_RUNNING + signal × (PWM_MAX − PWM_MIN_RUNNING)
         # so a signal value of 0.5 always means 50% of the running range, regardless of mode.
@@ -941,13 +1256,13 @@ class WindWallGUI(QMainWindow):
         # Subtracting a small trough margin pushes dc_offset just below amplitude so
         # the SignalGenerator clips the trough to 0.0, and the flight loop idles.
         if amp_min <= 0.0 and swing > 0.0:
-            if signal_type == "Square Wave":
+            if signal_kind == SIGNAL_SQUARE:
                 trough_margin = 0.06 * swing  # overcome Gibbs (~4.5% of amplitude)
             else:
                 trough_margin = 0.001 * swing  # floating-point safety for sine
             dc_offset -= trough_margin
 
-        if signal_type == "Sine Wave":
+        if signal_kind == SIGNAL_SINE:
             coeffs = generate_sine_wave(
                 n_motors=NUM_MOTORS,
                 amplitude=amplitude,
@@ -956,7 +1271,7 @@ class WindWallGUI(QMainWindow):
                 n_terms=n_terms,
                 base_freq=base_freq
             )
-        elif signal_type == "Square Wave":
+        else:  # SIGNAL_SQUARE
             amplitude_half_range = swing / 2.0
             coeffs = generate_square_pulse(
                 n_motors=NUM_MOTORS,
@@ -967,12 +1282,6 @@ class WindWallGUI(QMainWindow):
                 base_freq=base_freq
             )
             coeffs[:, 0] = dc_offset  # midpoint shifted below amplitude to ensure trough < 0
-        else:  # Constant DC
-            coeffs = generate_uniform(
-                n_motors=NUM_MOTORS,
-                value=dc_value,
-                n_terms=n_terms
-            )
         
         return coeffs, np.zeros((NUM_MOTORS, n_terms))  # zero phases for non-custom types
 
@@ -984,7 +1293,14 @@ class WindWallGUI(QMainWindow):
         fraction (0.0–1.0).  The flight loop maps it as:
             pwm = PWM_MIN_RUNNING + signal × (PWM_MAX − PWM_MIN_RUNNING)
         No separate amp_min offset is needed in the flight loop.
+
+        The (read-only) result is reused until a group's parameters, period or
+        motor membership change.
         """
+        key = tuple((g.coefficient_key(), g.period, g.motors.tobytes()) for g in self.groups)
+        if key == self._fourier_key:
+            return self._fourier_cache
+
         # Determine max number of terms needed
         max_terms = max((g.fourier_terms for g in self.groups), default=7)
 
@@ -995,25 +1311,24 @@ class WindWallGUI(QMainWindow):
 
         # Process each group
         for group in self.groups:
-            if len(group.motors) == 0:
+            if not group.motors.any():
                 continue
 
             group_coeffs, group_phases = self.generate_group_coefficients(group)
-            group_omega = 2.0 * np.pi * (1.0 / group.period) if group.period > 0 else 2.0 * np.pi * BASE_FREQUENCY
 
             # Assign coefficients, phases, and omega to motors in this group
-            for motor_id in group.motors:
-                terms_to_copy = min(group_coeffs.shape[1], max_terms)
-                final_coeffs[motor_id, :terms_to_copy] = group_coeffs[motor_id, :terms_to_copy]
-                final_phases[motor_id, :terms_to_copy] = group_phases[motor_id, :terms_to_copy]
-                omega_per_motor[motor_id] = group_omega
-
-        # Motors not in any group get zero coefficients → signal=0 → PWM_MIN (idle)
-        for i, btn in enumerate(self.motor_buttons):
-            if btn.assigned_group is None:
-                final_coeffs[i, :] = 0.0
-
-        return final_coeffs, omega_per_motor, final_phases
+            motor_ids = np.flatnonzero(group.motors)
+            terms_to_copy = min(group_coeffs.shape[1], max_terms)
+            final_coeffs[motor_ids, :terms_to_copy] = group_coeffs[motor_ids, :terms_to_copy]
+            final_phases[motor_ids, :terms_to_copy] = group_phases[motor_ids, :terms_to_copy]
+            omega_per_motor[motor_ids] = group.omega
+
+        # Motors not in any group keep their zero rows → signal=0 → PWM_MIN (idle)
+        for array in (final_coeffs, omega_per_motor, final_phases):
+            array.flags.writeable = False
+        self._fourier_cache = (final_coeffs, omega_per_motor, final_phases)
+        self._fourier_key = key
+        return self._fourier_cache
 
     # ------------------------------------------------------------------
     # Preset save / load
@@ -1026,7 +1341,7 @@ class WindWallGUI(QMainWindow):
             out.append({
                 'name': g.name,
                 'color_index': g.color_index,
-                'motors': sorted(g.motors),
+                'motors': np.flatnonzero(g.motors).tolist(),
                 'signal_type': g.signal_type,
                 'amp_min': g.amp_min,
                 'amp_max': g.amp_max,
@@ -1040,7 +1355,6 @@ class WindWallGUI(QMainWindow):
 
     def save_preset(self):
         """Save current group and signal configuration to a JSON file."""
-        import json
         path, _ = QFileDialog.getSaveFileName(
             self, "Save Preset", "", "Preset files (*.json);;All files (*)"
         )
@@ -1061,7 +1375,6 @@ class WindWallGUI(QMainWindow):
 
     def load_preset(self):
         """Load a group configuration from a JSON preset file."""
-        import json
         if self.experiment_running:
             QMessageBox.warning(self, "Experiment running",
                                 "Stop the experiment before loading a preset.")
@@ -1088,7 +1401,7 @@ class WindWallGUI(QMainWindow):
             self.groups_list.clear()
             for gd in data.get('groups', []):
                 g = MotorGroup(gd['name'], gd.get('color_index', 0))
-                g.motors = set(gd.get('motors', []))
+                g.motors[np.asarray(gd.get('motors', []), dtype=np.intp)] = True
                 g.signal_type = gd.get('signal_type', 'Sine Wave')
                 g.amp_min = gd.get('amp_min', 0.0)
                 g.amp_max = gd.get('amp_max', 1.0)
@@ -1100,13 +1413,12 @@ class WindWallGUI(QMainWindow):
                 self.groups.append(g)
                 self.groups_list.addItem(g.name)
 
-            # Restore motor button assignments
+            # Restore motor button assignments (first listed group wins)
+            ids = self.button_group_ids
+            ids[:] = -1
+            for index in range(len(self.groups) - 1, -1, -1):
+                ids[self.groups[index].motors] = index
             for btn in self.motor_buttons:
-                btn.assigned_group = None
-                for g in self.groups:
-                    if btn.motor_id in g.motors:
-                        btn.assigned_group = g
-                        break
                 btn.update_style()
 
             # Restore signal mode
@@ -1143,17 +1455,7 @@ class WindWallGUI(QMainWindow):
             return
         self.is_armed = True
         self.arm_btn.setText("Disarm")
-        self.arm_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #d32f2f; }
-        """)
+        self.arm_btn.setStyleSheet(_DISARM_BUTTON_STYLE)
         self.start_btn.setEnabled(True)
 
     def disarm(self):
@@ -1163,40 +1465,33 @@ class WindWallGUI(QMainWindow):
         self._stop_heartbeat()
         self.is_armed = False
         self.arm_btn.setText("Arm Motors")
-        self.arm_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF9800;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #F57C00; }
-        """)
+        self.arm_btn.setStyleSheet(_ARM_BUTTON_STYLE)
         self.start_btn.setEnabled(False)
 
     def _start_heartbeat(self):
         """Start background thread that sends 1000 µs at 20 Hz while armed."""
-        import threading
-        import time
-        import platform
-        from src.hardware.interface import HardwareInterface
-        from config import NUM_MOTORS
-
         self._stop_heartbeat()  # ensure no stale thread
 
         stop = threading.Event()
         self.heartbeat_stop_event = stop
 
         def _loop():
-            use_mock = platform.system() != "Linux"
-            hw = HardwareInterface(use_mock=use_mock)
+            hw = HardwareInterface(use_mock=USE_MOCK_HARDWARE)
             idle = np.full(NUM_MOTORS, float(PWM_MIN))
+            # 20 Hz — well inside the 200 ms Pico watchdog.  Frames are paced
+            # against absolute deadlines so the period does not drift, and the
+            # wait returns as soon as the heartbeat is stopped.
+            period_ns = 50_000_000
+            next_ns = time.perf_counter_ns()
             try:
                 while not stop.is_set():
                     hw.send_pwm(idle)
-                    time.sleep(0.05)  # 20 Hz — well inside the 200 ms Pico watchdog
+                    next_ns += period_ns
+                    remaining_ns = next_ns - time.perf_counter_ns()
+                    if remaining_ns < 0:
+                        next_ns -= remaining_ns  # fell behind: resync, don't burst
+                    elif stop.wait(remaining_ns * 1e-9):
+                        break
             except Exception as e:
                 print(f"[Heartbeat] Error: {e}")
             finally:
@@ -1214,7 +1509,7 @@ class WindWallGUI(QMainWindow):
         if self.heartbeat_stop_event is not None:
             self.heartbeat_stop_event.set()
         if self.heartbeat_thread is not None:
-            self.heartbeat_thread.join(timeout=0.3)  # max one sleep cycle (50 ms) + margin
+            self.heartbeat_thread.join(timeout=0.3)  # wait() wakes at once; margin for a send in flight
         self.heartbeat_stop_event = None
         self.heartbeat_thread = None
         print("[Heartbeat] Stopped")
@@ -1235,8 +1530,7 @@ class WindWallGUI(QMainWindow):
             signal_table = self.direct_signal_table
             signal_rate = self.direct_signal_rate_hz
         else:
-            active_count = sum(1 for btn in self.motor_buttons if btn.assigned_group is not None)
-            if active_count == 0:
+            if self.active_motor_count == 0:
                 QMessageBox.warning(self, "No Motors Assigned",
                                     "Please assign at least one motor to a group!")
                 return
@@ -1246,23 +1540,15 @@ class WindWallGUI(QMainWindow):
         # Reset experiment timeline for fresh start
         self.experiment_start_time = None
 
-        # Create queue for live parameter updates (GUI → flight_loop)
-        self.param_queue = multiprocessing.Queue()
+        # Shared memory: created on the first run, then reused and reset
+        self._prepare_shared_buffers()
 
         # Update UI
         self.experiment_running = True
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.status_label.setText("Running...")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                background-color: #c8e6c9;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-                color: #2e7d32;
-            }
-        """)
+        self.status_label.setStyleSheet(_STATUS_RUNNING_STYLE)
 
         # Disable group/signal configuration during experiment
         # (Apply Group Live button stays enabled to allow mid-run parameter pushes)
@@ -1276,89 +1562,71 @@ class WindWallGUI(QMainWindow):
         self.start_live_monitor()
 
         # Start experiment in separate thread
-        import threading
-        experiment_thread = threading.Thread(
+        self.experiment_thread = threading.Thread(
             target=self.run_experiment_thread,
             args=(coeffs, omega_per_motor, phase_radians, signal_table, signal_rate)
         )
-        experiment_thread.daemon = True
-        experiment_thread.start()
+        self.experiment_thread.daemon = True
+        self.experiment_thread.start()
     
     def run_experiment_thread(self, coeffs, omega_per_motor,
                               phase_radians=None, signal_table=None, signal_sample_rate_hz=None):
         """Run the experiment (called in separate thread)."""
-        import json
+        table_shm = None
         try:
             duration = self.duration.value()
             # Shared log stem — both CSV and JSON sidecar use the same name
-            from datetime import datetime as _dt
-            log_stem = _dt.now().strftime('%Y%m%d_%H%M%S')
-
-            import platform
-            import time
-            from src.core.flight_loop import flight_loop
-            from config import BASE_FREQUENCY, MAX_PWM_SLEW_LIMIT
+            log_stem = datetime.now().strftime('%Y%m%d_%H%M%S')
 
             # Slew limit: unlimited for square waves in Fourier mode; default otherwise
             square_wave_present = (signal_table is None and
-                any(g.signal_type == "Square Wave" and len(g.motors) > 0 for g in self.groups))
+                any(g.signal_kind == SIGNAL_SQUARE and g.motors.any() for g in self.groups))
             slew_limit_override = float('inf') if square_wave_present else MAX_PWM_SLEW_LIMIT
 
             # Stop heartbeat before flight process opens hardware (SPI can't be shared)
             self._stop_heartbeat()
 
-            self.stop_event = multiprocessing.Event()
-            self.shared_buffer = MotorStateBuffer(create=True)
-
-            use_mock = platform.system() != "Linux"
+            self._ensure_flight_worker()
+            self.stop_event.clear()
+            self.flight_done.clear()
 
             flight_kwargs = dict(
-                stop_event=self.stop_event,
-                use_mock_hardware=use_mock,
+                use_mock_hardware=USE_MOCK_HARDWARE,
                 enable_logging=True,
                 log_interval_frames=40,
                 slew_limit_override=slew_limit_override,
                 duration_s=float(duration),
                 log_stem=log_stem,
-                param_queue=self.param_queue,
+                live_params=True,
             )
             if signal_table is not None:
-                flight_kwargs['signal_table'] = signal_table
+                # Hand the table over by shared-memory name instead of pickling it
+                table_shm, flight_kwargs['signal_table_spec'] = share_ndarray(signal_table)
                 flight_kwargs['signal_sample_rate_hz'] = signal_sample_rate_hz
             else:
-                flight_kwargs['fourier_coeffs'] = coeffs
-                flight_kwargs['base_freq'] = BASE_FREQUENCY
-                flight_kwargs['omega_per_motor'] = omega_per_motor
-                if phase_radians is not None:
-                    flight_kwargs['phase_radians'] = phase_radians
                 # Signal values are absolute speed fractions [0, 1].
                 # value_min = 0 so unassigned motors (signal=0) idle at PWM_MIN.
                 # value_max = highest signal peak across all active groups.
-                active_groups = [g for g in self.groups if len(g.motors) > 0]
-                if active_groups:
-                    flight_kwargs['value_min'] = 0.0
-                    flight_kwargs['value_max'] = max(
-                        g.dc_value if g.signal_type == "Constant DC" else g.amp_max
-                        for g in active_groups
-                    )
-                else:
-                    flight_kwargs['value_min'] = 0.0
-                    flight_kwargs['value_max'] = 1.0
-
-            self.flight_process = multiprocessing.Process(
-                target=flight_loop,
-                kwargs=flight_kwargs,
-                name="FlightLoop",
-                daemon=False
-            )
-            self.flight_process.start()
+                active_groups = [g for g in self.groups if g.motors.any()]
+                value_max = max(
+                    g.dc_value if g.signal_kind == SIGNAL_DC else g.amp_max
+                    for g in active_groups
+                ) if active_groups else 1.0
+                # The initial coefficient/omega/phase set goes through the
+                # parameter buffer rather than being pickled into the command
+                if phase_radians is None:
+                    phase_radians = np.zeros_like(coeffs)
+                self.param_buffer.publish(coeffs, omega_per_motor, phase_radians, float(value_max))
+                flight_kwargs['base_freq'] = BASE_FREQUENCY
+                flight_kwargs['value_min'] = 0.0
+
+            self.flight_commands.put(flight_kwargs)
 
             # Write JSON metadata sidecar alongside the CSV log
             try:
-                from pathlib import Path as _Path
                 sidecar = {
                     'log_stem': log_stem,
-                    'experiment_start': _dt.now().isoformat(),
+                    'experiment_start': datetime.now().isoformat(),
                     'duration_s': float(duration),
                     'signal_mode': 'Direct' if signal_table is not None else 'Fourier',
                     'groups': self._groups_to_dict(),
@@ -1367,7 +1635,7 @@ class WindWallGUI(QMainWindow):
                     sidecar['direct_file_rows'] = int(signal_table.shape[0])
                     sidecar['direct_file_cols'] = int(signal_table.shape[1])
                     sidecar['direct_sample_rate_hz'] = signal_sample_rate_hz
-                sidecar_path = _Path('logs') / f'flight_log_{log_stem}.json'
+                sidecar_path = Path('logs') / f'flight_log_{log_stem}.json'
                 sidecar_path.parent.mkdir(exist_ok=True)
                 with open(sidecar_path, 'w') as _f:
                     json.dump(sidecar, _f, indent=2)
@@ -1375,42 +1643,34 @@ class WindWallGUI(QMainWindow):
             except Exception as _e:
                 print(f"[GUI] Warning: could not write metadata sidecar: {_e}")
 
-            # Wait until flight process writes its first frame (max 3 s),
-            # then anchor the monitor clock to that exact moment so the GUI
-            # x-axis aligns with the actual signal start.
-            _deadline = time.perf_counter() + 3.0
-            while time.perf_counter() < _deadline:
-                if self.shared_buffer.get_pwm().any():
-                    self.experiment_start_time = time.perf_counter()
+            # Wait until flight process writes its first frame, then anchor the
+            # monitor clock to that exact moment so the GUI x-axis aligns with
+            # the actual signal start.  No fixed limit: a freshly spawned worker
+            # re-imports this module (Qt, pyqtgraph) and may JIT-compile before
+            # its first frame, which can take several seconds on a Pi.  The
+            # wait ends early if the run fails, the worker dies or Stop is pressed.
+            while self.shared_buffer.get_frame_count() == 0:
+                if (self.flight_done.is_set() or not self.flight_process.is_alive()
+                        or self.stop_event.wait(0.01)):
+                    print("[GUI] Warning: run ended before the flight process sent its first frame")
                     break
-                time.sleep(0.01)
             else:
-                print("[GUI] Warning: flight process did not become ready within 3 s")
+                self.experiment_start_time = time.perf_counter()
             
-            start_time = time.perf_counter()
-            while self.flight_process.is_alive():
-                time.sleep(0.1)
-                if self.stop_event.is_set():
+            deadline_ns = time.perf_counter_ns() + int(duration * 1e9)
+            while not self.flight_done.is_set() and self.flight_process.is_alive():
+                # Returns as soon as Stop is pressed instead of after a full sleep
+                if self.stop_event.wait(0.1):
                     break
-                if time.perf_counter() - start_time >= duration:
+                if time.perf_counter_ns() >= deadline_ns:
+                    self.shared_buffer.request_stop()
                     self.stop_event.set()
                     break
             
-            self.flight_process.join(timeout=2)
-            if self.flight_process.is_alive():
-                self.flight_process.terminate()
-                self.flight_process.join()
-            
-            # Detach monitor buffer BEFORE unlinking shared memory — prevents the
-            # monitor timer from reading freed memory between unlink and delattr.
-            if hasattr(self, '_monitor_buffer'):
-                try:
-                    self._monitor_buffer.close()
-                except Exception:
-                    pass
-                delattr(self, '_monitor_buffer')
-            self.shared_buffer.close()
-            self.shared_buffer.unlink()
+            if not self.flight_done.wait(timeout=2):
+                # Run did not wind down — discard the worker; the next
+                # experiment starts a fresh one
+                self._shutdown_flight_worker(timeout=0)
 
             # Resume heartbeat so ESCs stay armed between experiments
             if self.is_armed:
@@ -1418,18 +1678,89 @@ class WindWallGUI(QMainWindow):
 
         except Exception as e:
             print(f"[GUI] Experiment error: {e}")
-            import traceback
             traceback.print_exc()
         finally:
-            QTimer.singleShot(0, self.experiment_finished)
+            if table_shm is not None:
+                table_shm.close()
+                table_shm.unlink()
+            self.experimentFinished.emit()
+    
+    def _ensure_flight_worker(self):
+        """Start the long-lived flight worker process if it is not running."""
+        if self.flight_process is not None and self.flight_process.is_alive():
+            return
+
+        # Spawn rather than fork: the worker starts from a fresh interpreter
+        # instead of inheriting a copy of the Qt application and its threads
+        ctx = multiprocessing.get_context('spawn')
+        self.flight_commands = ctx.Queue()
+        self.stop_event = ctx.Event()
+        self.flight_done = ctx.Event()
+        self.flight_process = ctx.Process(
+            target=flight_worker,
+            args=(self.flight_commands, self.stop_event, self.flight_done),
+            name="FlightLoop",
+            daemon=True
+        )
+        self.flight_process.start()
+    
+    def _shutdown_flight_worker(self, timeout=2.0):
+        """Ask the flight worker to exit, terminating it if it does not."""
+        if self.flight_process is None:
+            return
+        if self.flight_process.is_alive() and timeout > 0:
+            if self.shared_buffer is not None:
+                self.shared_buffer.request_stop()
+            self.stop_event.set()
+            self.flight_commands.put(None)
+            self.flight_process.join(timeout=timeout)
+        if self.flight_process.is_alive():
+            self.flight_process.terminate()
+            self.flight_process.join()
+        self.flight_process = None
+        self.flight_commands = None
+    
+    def _prepare_shared_buffers(self):
+        """Create the motor-state and parameter segments once; reset them on reuse."""
+        if self.shared_buffer is None:
+            self.shared_buffer = MotorStateBuffer(create=True)
+            # Live parameter updates (GUI → flight_loop); the flight loop only
+            # applies sets published after it attaches, so no reset is needed
+            self.param_buffer = ParameterBuffer(create=True)
+        else:
+            self.shared_buffer.reset()
+    
+    def _release_shared_buffers(self):
+        """Close and unlink the shared memory segments."""
+        for buffer in (self.shared_buffer, self.param_buffer):
+            if buffer is not None:
+                buffer.close()
+                buffer.unlink()
+        self.shared_buffer = None
+        self.param_buffer = None
+    
+    def closeEvent(self, event):
+        """Stop any running experiment and the flight worker on window close."""
+        # The experiment thread still polls the worker and the shared buffer,
+        # so it must wind down before either is torn down
+        if self.experiment_thread is not None and self.experiment_thread.is_alive():
+            if self.shared_buffer is not None:
+                self.shared_buffer.request_stop()
+            if self.stop_event is not None:
+                self.stop_event.set()
+            self.experiment_thread.join(timeout=5.0)
+            if self.experiment_thread.is_alive():
+                print("[GUI] Warning: experiment thread did not stop within 5 s")
+        self.experiment_thread = None
+        self._stop_heartbeat()
+        self._shutdown_flight_worker()
+        self._release_shared_buffers()
+        super().closeEvent(event)
     
     def start_live_monitor(self):
         """Start live monitoring with fresh data."""
         # Clear previous data for a fresh start
         self.clear_monitor_data()
-        # Reset monitor buffer so we attach to the new shared memory
-        if hasattr(self, '_monitor_buffer'):
-            delattr(self, '_monitor_buffer')
         
         # Reset or create timer
         if self.monitor_timer is not None:
@@ -1440,6 +1771,7 @@ class WindWallGUI(QMainWindow):
         self.monitor_timer.setTimerType(Qt.TimerType.PreciseTimer)  # 1 ms resolution on Windows
         self.monitor_timer.timeout.connect(self.update_live_monitor)
         self.monitor_timer.start(25)  # 40 Hz update
+        self._render_timer.start(50)  # 20 Hz repaint
     
     def update_live_monitor(self):
         """Update live monitor plot with oscilloscope-style continuous timeline."""
@@ -1450,73 +1782,64 @@ class WindWallGUI(QMainWindow):
             return
         
         try:
-            import time
             if self.experiment_start_time is None:
                 return  # clock not yet anchored — skip this tick
             current_time = time.perf_counter() - self.experiment_start_time
             
-            # Attach to shared memory if not already
-            if not hasattr(self, '_monitor_buffer'):
-                self._monitor_buffer = MotorStateBuffer(create=False)
-            
-            pwm_values = self._monitor_buffer.get_pwm()
+            pwm_values = self.shared_buffer.get_pwm(out=self.monitor_pwm)
             
             # Get value based on monitor type
-            if self.monitor_type.currentText() == "Individual Motor":
+            if self.monitor_mode == MONITOR_INDIVIDUAL:
                 motor_id = self.monitor_motor_select.currentIndex()
                 pwm_value = pwm_values[motor_id]
             else:  # Group Average
                 group_index = self.monitor_group_select.currentIndex()
                 if 0 <= group_index < len(self.groups):
                     group = self.groups[group_index]
-                    if len(group.motors) > 0:
-                        group_pwms = [pwm_values[m] for m in group.motors]
-                        pwm_value = np.mean(group_pwms)
+                    if group.motors.any():
+                        pwm_value = pwm_values[group.motors].mean()
                     else:
                         pwm_value = PWM_MIN
                 else:
                     pwm_value = PWM_MIN
             
-            self.monitor_data_time.append(current_time)
-            self.monitor_data_pwm.append(pwm_value)
-            
-            # Update plot with sliding 5-second window
-            time_data = list(self.monitor_data_time)
-            pwm_data = list(self.monitor_data_pwm)
-            self.plot_curve.setData(time_data, pwm_data)
-            
-            # Auto-scale X-axis to show last 5 seconds (sliding window)
-            if len(time_data) > 0:
-                max_time = time_data[-1]
-                min_time = max(0, max_time - 5.0)  # Show 5-second window
-                self.plot_widget.setXRange(min_time, max_time + 0.5, padding=0)
+            self.push_monitor_sample(current_time, pwm_value)
+            self._plot_time = current_time
+            self._plot_dirty = True
             
         except Exception as e:
             print(f"[Monitor] Error: {e}")
     
+    def _flush_plot(self):
+        """Redraw the monitor plot from the ring buffer if new samples arrived."""
+        if not self._plot_dirty:
+            return
+        self._plot_dirty = False
+        
+        # Update plot with sliding 5-second window
+        time_data, pwm_data = self.monitor_samples()
+        self.plot_curve.setData(time_data, pwm_data)
+        
+        # Auto-scale X-axis to show last 5 seconds (sliding window)
+        if len(time_data) > 0:
+            max_time = self._plot_time
+            min_time = max(0, max_time - 5.0)  # Show 5-second window
+            self.plot_widget.setXRange(min_time, max_time + 0.5, padding=0)
+    
     def stop_experiment(self):
         """Stop the running experiment immediately."""
         if self.experiment_running and self.stop_event:
             print("[GUI] Stop button pressed - stopping experiment...")
+            self.shared_buffer.request_stop()
             self.stop_event.set()
             
             # Stop live monitoring timer completely
             if self.monitor_timer is not None:
                 self.monitor_timer.stop()
                 self.monitor_timer = None  # Reset timer object
-            if hasattr(self, '_monitor_buffer'):
-                delattr(self, '_monitor_buffer')
             
             self.status_label.setText("Stopping...")
-            self.status_label.setStyleSheet("""
-                QLabel {
-                    background-color: #fff9c4;
-                    padding: 10px;
-                    border-radius: 5px;
-                    font-weight: bold;
-                    color: #f57f17;
-                }
-            """)
+            self.status_label.setStyleSheet(_STATUS_STOPPING_STYLE)
     
     def experiment_finished(self):
         """Called when experiment finishes."""
@@ -1525,12 +1848,11 @@ class WindWallGUI(QMainWindow):
         # Stop and clear live monitoring
         if self.monitor_timer is not None:
             self.monitor_timer.stop()
+        self._render_timer.stop()
         
         # Reset experiment timeline for next experiment
         self.experiment_start_time = None
         self.clear_monitor_data()
-        if hasattr(self, '_monitor_buffer'):
-            delattr(self, '_monitor_buffer')
         
         if self.auto_disarm_cb.isChecked():
             self.disarm()
@@ -1538,25 +1860,13 @@ class WindWallGUI(QMainWindow):
             self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.status_label.setText("Finished")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                background-color: #e3f2fd;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-        """)
-        
-        # Stop live monitoring
-        if self.monitor_timer:
-            self.monitor_timer.stop()
+        self.status_label.setStyleSheet(_STATUS_READY_STYLE)
         
         # Re-enable group configuration
         self.groups_list.setEnabled(True)
         self.signal_type.setEnabled(True)
         self.signal_mode.setEnabled(True)
         self.apply_group_btn.setEnabled(False)
-        self.param_queue = None
         
         QMessageBox.information(self, "Experiment Complete", 
                               "Experiment finished! Check the logs folder for data.")
@@ -1564,10 +1874,6 @@ class WindWallGUI(QMainWindow):
 
 def main_gui():
     """Main entry point for GUI."""
-    import platform as _platform
-    if _platform.system() != 'Windows':
-        multiprocessing.set_start_method('fork', force=True)
-    
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
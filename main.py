@@ -4,7 +4,6 @@ Launches flight_loop process and waits for termination.
 """
 
 import multiprocessing
-multiprocessing.set_start_method('fork', force=True)
 import sys
 import signal
 import time
@@ -58,16 +57,20 @@ def main(
         )
         # Set DC to midpoint 0.5 so output spans [0,1]
         fourier_coeffs[:, 0] = 0.5
-        # Per-motor omega array (all motors share the same default period here)
-        omega_per_motor = np.full(NUM_MOTORS, 2.0 * np.pi * default_base_freq, dtype=float)
+        base_freq = default_base_freq
     else:
-        # If user provides coeffs, use uniform omega based on BASE_FREQUENCY
-        omega_per_motor = np.full(NUM_MOTORS, 2.0 * np.pi * BASE_FREQUENCY, dtype=float)
+        # If user provides coeffs, use BASE_FREQUENCY
+        base_freq = BASE_FREQUENCY
+    # All motors share one frequency, so no per-motor omega array is sent;
+    # the signal generator derives it from base_freq
     
     print(f"[Main] Signal shape: {fourier_coeffs.shape}")
     
+    # The flight process is spawned (fresh interpreter) rather than forked
+    ctx = multiprocessing.get_context('spawn')
+
     # Create stop event for clean shutdown
-    stop_event = multiprocessing.Event()
+    stop_event = ctx.Event()
     
     # Initialize shared memory
     print("[Main] Initializing shared memory buffer...")
@@ -87,14 +90,14 @@ def main(
     
     # Launch flight control process
     print(f"[Main] Launching flight_loop process (logging={'ON' if enable_logging else 'OFF'})...")
-    flight_process = multiprocessing.Process(
+    flight_process = ctx.Process(
         target=flight_loop,
         args=(stop_event,),
         kwargs=dict(
             use_mock_hardware=use_mock,
             fourier_coeffs=fourier_coeffs,
-            base_freq=BASE_FREQUENCY,
-            omega_per_motor=omega_per_motor,
+            base_freq=base_freq,
+            omega_per_motor=None,
             phase_radians=None,
             start_time_offset=start_delay_s,
             value_min=value_min,
@@ -122,21 +125,27 @@ def main(
         # Handle Ctrl+C gracefully
         def signal_handler(sig, frame):
             print("\n[Main] Ctrl+C detected, shutting down...")
+            shared_buffer.request_stop()
             stop_event.set()
         
         signal.signal(signal.SIGINT, signal_handler)
         
-        # Monitor for duration or manual stop
+        # Monitor for duration or manual stop: sleep on the stop event until
+        # the deadline, waking every 0.5 s only to notice a dead flight process
+        deadline = (start_wall + experiment_duration_s
+                    if experiment_duration_s is not None else None)
         while flight_process.is_alive():
-            time.sleep(0.1)
-            if stop_event.is_set():
-                break
-            if experiment_duration_s is not None:
-                elapsed = time.perf_counter() - start_wall
-                if elapsed >= experiment_duration_s:
+            timeout = 0.5
+            if deadline is not None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
                     print(f"[Main] Experiment duration reached ({experiment_duration_s}s); stopping...")
+                    shared_buffer.request_stop()
                     stop_event.set()
                     break
+                timeout = min(remaining, timeout)
+            if stop_event.wait(timeout):
+                break
         
         # Ensure process exits
         flight_process.join(timeout=2)
@@ -147,6 +156,7 @@ def main(
     finally:
         # Cleanup
         print("[Main] Cleaning up...")
+        shared_buffer.request_stop()
         stop_event.set()
         
         # Wait for flight process to finish
@@ -152,10 +152,9 @@ def motor_pins_for_pico(pico_id):
     """
     try:
         from config import FULL_PICO_MOTOR_MAP
-        for _, cfg in FULL_PICO_MOTOR_MAP.items():
-            if cfg['pico_id'] == pico_id:
-                offset = cfg.get('pin_offset', 0)
-                pins = [offset + i for i in range(len(cfg['motors']))]
+        for quadrant in FULL_PICO_MOTOR_MAP.values():
+            if quadrant.pico_id == pico_id:
+                pins = [quadrant.pin_offset + i for i in range(len(quadrant.motors))]
                 return '{' + ', '.join(str(p) for p in pins) + '}'
     except ImportError:
         pass
@@ -3,21 +3,68 @@ Shared memory management for inter-process communication.
 Provides safe access to motor control state and telemetry data.
 """
 
+import zlib
 import numpy as np
 from multiprocessing import shared_memory
 from typing import Tuple, Optional
-from config import NUM_MOTORS, SHARED_MEM_NAME
+from config import (
+    NUM_MOTORS, SHARED_MEM_NAME, SHARED_MEM_SIZE,
+    SHM_CACHE_LINE, SHM_CONTROL_OFFSET, SHM_STOP_FLAG_OFFSET, SHM_PWM_OFFSET, SHM_RPM_OFFSET,
+    PARAM_MEM_NAME, MAX_FOURIER_TERMS,
+)
+
+
+def _open_segment(name: str, size: int, create: bool) -> shared_memory.SharedMemory:
+    """Create (replacing any stale segment of the same name) or attach to `name`."""
+    if not create:
+        return shared_memory.SharedMemory(name=name)
+    try:
+        existing = shared_memory.SharedMemory(name=name)
+        existing.close()
+        existing.unlink()
+    except (FileNotFoundError, ValueError):
+        pass
+    return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+def share_ndarray(arr: np.ndarray) -> Tuple[shared_memory.SharedMemory, tuple]:
+    """
+    Copy `arr` into a new anonymous shared memory segment.
+
+    Returns (shm, spec); pass only `spec` (name, shape, dtype string) to the
+    other process and rebuild the array there with attach_ndarray().  The
+    caller owns `shm` and must close and unlink it once the reader is done.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def attach_ndarray(spec: tuple) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Attach to an array published by share_ndarray(); returns (shm, view)."""
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
 
 
 class MotorStateBuffer:
     """
-    Manages a shared memory buffer for motor PWM commands.
+    Manages a shared memory buffer for motor PWM commands and RPM telemetry.
 
-    Layout:
-    - Bytes 0 – 287 : PWM values  [36 × float64]  (1000–2000 µs)
+    Layout (separate planes, each 64-byte aligned, see config SHM_* constants):
+    - Bytes   0 –   7 : frame counter [uint64], bumped on every set_pwm()
+    - Byte          8 : stop flag [uint8], raised by request_stop(); the flight
+                        loop polls it every tick (a plain load, unlike Event.is_set)
+    - Bytes  64 – 135 : PWM values  [36 × int16]  (1000–2000 µs, whole microseconds)
+    - Bytes 192 – 263 : RPM values  [36 × float16]  (~3 significant digits, max 65504)
     """
 
-    _PWM_OFFSET = 0
+    _CONTROL_OFFSET = SHM_CONTROL_OFFSET
+    _STOP_FLAG_OFFSET = SHM_STOP_FLAG_OFFSET
+    _PWM_OFFSET = SHM_PWM_OFFSET
+    _RPM_OFFSET = SHM_RPM_OFFSET
+    _RPM_DTYPE = np.float16
 
     def __init__(self, create: bool = True):
         """
@@ -28,46 +75,202 @@ class MotorStateBuffer:
         """
         self.name = SHARED_MEM_NAME
         self.shape = (NUM_MOTORS,)
-        self.dtype = np.float64
+        self.dtype = np.int16
 
         try:
             if create:
-                # Try to unlink any existing buffer first
-                try:
-                    existing = shared_memory.SharedMemory(name=self.name)
-                    existing.close()
-                    existing.unlink()
-                except (FileNotFoundError, ValueError):
-                    pass
-
-                # Create new shared memory block (PWM array only)
-                self.shm = shared_memory.SharedMemory(
-                    name=self.name,
-                    create=True,
-                    size=NUM_MOTORS * 8  # 288 bytes
-                )
-                self.array = np.ndarray(self.shape, dtype=self.dtype,
-                                        buffer=self.shm.buf, offset=self._PWM_OFFSET)
-                self.array[:] = 0.0
+                # Create new shared memory block (control line + PWM and RPM planes)
+                self.shm = _open_segment(self.name, SHARED_MEM_SIZE, create=True)
+                self._map_views()
+                self.reset()
                 print(f"[SharedMem] Created new buffer: {self.name}")
             else:
                 # Attach to existing shared memory
-                self.shm = shared_memory.SharedMemory(name=self.name)
-                self.array = np.ndarray(self.shape, dtype=self.dtype,
-                                        buffer=self.shm.buf, offset=self._PWM_OFFSET)
+                self.shm = _open_segment(self.name, SHARED_MEM_SIZE, create=False)
+                self._map_views()
                 print(f"[SharedMem] Attached to existing buffer: {self.name}")
 
         except Exception as e:
             print(f"[SharedMem] ERROR: Failed to initialize buffer: {e}")
             raise
 
+    def _map_views(self) -> None:
+        """Create the numpy views onto each region of the segment."""
+        self.frame_counter = np.ndarray((1,), dtype=np.uint64,
+                                        buffer=self.shm.buf, offset=self._CONTROL_OFFSET)
+        self.stop_flag = np.ndarray((1,), dtype=np.uint8,
+                                    buffer=self.shm.buf, offset=self._STOP_FLAG_OFFSET)
+        self.array = np.ndarray(self.shape, dtype=self.dtype,
+                                buffer=self.shm.buf, offset=self._PWM_OFFSET)
+        self.rpm = np.ndarray(self.shape, dtype=self._RPM_DTYPE,
+                              buffer=self.shm.buf, offset=self._RPM_OFFSET)
+
+    def reset(self) -> None:
+        """Zero the PWM and RPM planes, frame counter and stop flag (segment is reused as-is)."""
+        self.array.fill(0)
+        self.rpm.fill(0)
+        self.frame_counter[0] = 0
+        self.stop_flag[0] = 0
+
+    def request_stop(self) -> None:
+        """Ask the flight loop attached to this buffer to stop after its current tick."""
+        self.stop_flag[0] = 1
+
+    def stop_requested(self) -> bool:
+        """True once request_stop() has been called since the last reset()."""
+        return bool(self.stop_flag[0])
+
     def set_pwm(self, pwm_values: np.ndarray) -> None:
-        """Update PWM values in shared memory."""
-        self.array[:] = pwm_values
+        """Update PWM values in shared memory (rounded to whole microseconds)."""
+        np.rint(pwm_values, out=self.array, casting='unsafe')
+        self.frame_counter[0] += 1
+
+    def set_rpm(self, rpm_values: np.ndarray) -> None:
+        """Update RPM telemetry in shared memory."""
+        self.rpm[:] = rpm_values
+
+    def get_rpm(self) -> np.ndarray:
+        """Read RPM telemetry from shared memory (widened to float32)."""
+        return self.rpm.astype(np.float32)
+
+    def get_frame_count(self) -> int:
+        """Number of set_pwm() calls since the buffer was created or last reset."""
+        return int(self.frame_counter[0])
+
+    def get_pwm(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Read PWM values from shared memory (into `out` if given, else a new array)."""
+        if out is None:
+            return self.array.copy()
+        np.copyto(out, self.array)
+        return out
+
+    def close(self) -> None:
+        """Close the shared memory buffer (does not unlink)."""
+        if self.shm:
+            self.shm.close()
+            print(f"[SharedMem] Closed buffer: {self.name}")
+
+    def unlink(self) -> None:
+        """Unlink the shared memory buffer (cleanup)."""
+        if self.shm:
+            try:
+                self.shm.unlink()
+                print(f"[SharedMem] Unlinked buffer: {self.name}")
+            except Exception as e:
+                print(f"[SharedMem] Warning: Could not unlink buffer: {e}")
+
+
+class ParameterBuffer:
+    """
+    Shared memory block carrying live signal parameters from the GUI to the
+    flight loop, replacing a pickled multiprocessing.Queue.
+
+    A single writer (GUI) and single reader (flight loop) coordinate through a
+    sequence counter (seqlock): the writer makes it odd, writes the payload,
+    then makes it even again; the reader copies the payload only when the
+    counter is even and unchanged across the copy, otherwise it retries on a
+    later tick.
+
+    The counter is a single aligned 8-byte load/store, but the numpy stores
+    and loads around it carry no memory fences, and aarch64 (the Pi) may
+    reorder them, so an unchanged counter alone does not prove the copy is
+    whole.  The writer therefore also stores a CRC32 of the payload and its
+    final seq; the reader accepts a copy only if the CRC matches, which
+    rejects torn copies and a stale payload read under a newer seq.
+
+    Layout (64-byte aligned regions):
+    - Control line  : seq [uint64], n_terms [uint64], value_max [float64],
+                      checksum [uint64]
+    - omega         : [NUM_MOTORS] float64 (rad/s)
+    - coeffs        : [NUM_MOTORS, MAX_FOURIER_TERMS] float64
+    - phases        : [NUM_MOTORS, MAX_FOURIER_TERMS] float64
+    """
+
+    _OMEGA_OFFSET = SHM_CACHE_LINE
+    _COEFFS_OFFSET = _OMEGA_OFFSET + -(-NUM_MOTORS * 8 // SHM_CACHE_LINE) * SHM_CACHE_LINE
+    _MATRIX_BYTES = -(-NUM_MOTORS * MAX_FOURIER_TERMS * 8 // SHM_CACHE_LINE) * SHM_CACHE_LINE
+    _PHASES_OFFSET = _COEFFS_OFFSET + _MATRIX_BYTES
+    SIZE = _PHASES_OFFSET + _MATRIX_BYTES
+
+    def __init__(self, create: bool = True):
+        """
+        Initialize the parameter buffer.
+
+        Args:
+            create: If True, create new buffer; if False, attach to existing
+        """
+        self.name = PARAM_MEM_NAME
+        try:
+            self.shm = _open_segment(self.name, self.SIZE, create)
+            buf = self.shm.buf
+            self.seq = np.ndarray((1,), dtype=np.uint64, buffer=buf, offset=0)
+            self.n_terms = np.ndarray((1,), dtype=np.uint64, buffer=buf, offset=8)
+            self.value_max = np.ndarray((1,), dtype=np.float64, buffer=buf, offset=16)
+            self.checksum = np.ndarray((1,), dtype=np.uint64, buffer=buf, offset=24)
+            self.omega = np.ndarray((NUM_MOTORS,), dtype=np.float64,
+                                    buffer=buf, offset=self._OMEGA_OFFSET)
+            matrix = (NUM_MOTORS, MAX_FOURIER_TERMS)
+            self.coeffs = np.ndarray(matrix, dtype=np.float64, buffer=buf, offset=self._COEFFS_OFFSET)
+            self.phases = np.ndarray(matrix, dtype=np.float64, buffer=buf, offset=self._PHASES_OFFSET)
+            if create:
+                self.seq[0] = 0
+                print(f"[SharedMem] Created new buffer: {self.name}")
+            else:
+                print(f"[SharedMem] Attached to existing buffer: {self.name}")
+        except Exception as e:
+            print(f"[SharedMem] ERROR: Failed to initialize buffer: {e}")
+            raise
+
+    def publish(self, coeffs: np.ndarray, omega_per_motor: np.ndarray,
+                phases: np.ndarray, value_max: float) -> None:
+        """Write a new parameter set (single writer only)."""
+        n_terms = coeffs.shape[1]
+        if n_terms > MAX_FOURIER_TERMS:
+            raise ValueError(f"{n_terms} Fourier terms exceeds MAX_FOURIER_TERMS={MAX_FOURIER_TERMS}")
+        seq = int(self.seq[0]) + 1
+        self.seq[0] = seq       # odd: write in progress
+        self.n_terms[0] = n_terms
+        self.value_max[0] = value_max
+        self.omega[:] = omega_per_motor
+        self.coeffs[:, :n_terms] = coeffs
+        self.phases[:, :n_terms] = phases
+        self.checksum[0] = self._checksum(seq + 1, float(self.value_max[0]), self.omega,
+                                          self.coeffs[:, :n_terms], self.phases[:, :n_terms])
+        self.seq[0] = seq + 1   # even: consistent
+
+    def read(self, last_seq: int) -> Optional[Tuple[int, dict]]:
+        """
+        Return (seq, update) if a complete parameter set newer than `last_seq`
+        is available, else None. The update dict has the keys
+        'coeffs', 'omega_per_motor', 'phases' and 'value_max'.
+        """
+        seq = int(self.seq[0])
+        if seq == last_seq or seq & 1:
+            return None
+        n_terms = min(int(self.n_terms[0]), MAX_FOURIER_TERMS)
+        checksum = int(self.checksum[0])
+        update = {
+            'coeffs': self.coeffs[:, :n_terms].copy(),
+            'omega_per_motor': self.omega.copy(),
+            'phases': self.phases[:, :n_terms].copy(),
+            'value_max': float(self.value_max[0]),
+        }
+        if int(self.seq[0]) != seq:
+            return None         # torn by a concurrent publish; retry next tick
+        if checksum != self._checksum(seq, update['value_max'], update['omega_per_motor'],
+                                      update['coeffs'], update['phases']):
+            return None         # reordered or torn copy; retry next tick
+        return seq, update
 
-    def get_pwm(self) -> np.ndarray:
-        """Read PWM values from shared memory."""
-        return self.array.copy()
+    @staticmethod
+    def _checksum(seq: int, value_max: float, omega: np.ndarray,
+                  coeffs: np.ndarray, phases: np.ndarray) -> int:
+        """CRC32 over seq, value_max and the payload arrays (n_terms is implied by their shape)."""
+        crc = zlib.crc32(np.array([seq], dtype=np.uint64))
+        crc = zlib.crc32(np.array([value_max, coeffs.shape[1]], dtype=np.float64), crc)
+        for arr in (omega, coeffs, phases):
+            crc = zlib.crc32(np.ascontiguousarray(arr, dtype=np.float64), crc)
+        return crc
 
     def close(self) -> None:
         """Close the shared memory buffer (does not unlink)."""
@@ -3,20 +3,59 @@ High-speed flight control loop (Process A).
 Runs at UPDATE_RATE_HZ (configured in config/__init__.py) with deterministic timing and safety checks.
 """
 
+import os
 import time
 import csv
+import ctypes
+import traceback
 from pathlib import Path
 from datetime import datetime
 import numpy as np
-from multiprocessing import Event
+from multiprocessing import Event, Queue
 from config import (
     NUM_MOTORS, UPDATE_RATE_HZ, PWM_MIN, PWM_MIN_RUNNING, PWM_MAX, PWM_CENTER,
-    MAX_PWM_SLEW_LIMIT, LOOP_TIME_MS, BASE_FREQUENCY,
-    SIGNAL_MIN_DEFAULT, SIGNAL_MAX_DEFAULT
+    MAX_PWM_SLEW_LIMIT, LOOP_TIME_MS, LOOP_TIME_NS, BASE_FREQUENCY,
+    SIGNAL_MIN_DEFAULT, SIGNAL_MAX_DEFAULT, FLIGHT_RT_PRIORITY, FLIGHT_CPU,
 )
 from src.hardware import HardwareInterface
 from src.physics import SignalGenerator, DirectSignalGenerator
-from src.core import MotorStateBuffer
+from src.core import MotorStateBuffer, ParameterBuffer, attach_ndarray
+
+# PWM bounds folded once into float64 scalars (the control math is float64),
+# so the per-frame numpy calls never coerce Python ints or redo the subtraction.
+_PWM_MIN_F = float(PWM_MIN)
+_PWM_MAX_F = float(PWM_MAX)
+_PWM_RUNNING_F = float(PWM_MIN_RUNNING)
+_PWM_SPAN_F = float(PWM_MAX - PWM_MIN_RUNNING)
+
+# All-idle frame, shared by the warm-up flush and shutdown
+_IDLE_PWM = np.full(NUM_MOTORS, _PWM_MIN_F)
+_IDLE_PWM.flags.writeable = False
+
+# mlockall() flags from <sys/mman.h>
+_MCL_CURRENT = 1
+_MCL_FUTURE = 2
+
+
+def _apply_realtime_policy() -> None:
+    """Pin the process to FLIGHT_CPU and/or switch it to SCHED_FIFO, if configured."""
+    if FLIGHT_CPU is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {FLIGHT_CPU})
+            print(f"[FlightLoop] Pinned to CPU {FLIGHT_CPU}")
+        except OSError as e:
+            print(f"[FlightLoop] Warning: could not pin to CPU {FLIGHT_CPU}: {e}")
+    if FLIGHT_RT_PRIORITY > 0 and hasattr(os, 'sched_setscheduler'):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(FLIGHT_RT_PRIORITY))
+        except OSError as e:
+            print(f"[FlightLoop] Warning: SCHED_FIFO unavailable ({e}); using default scheduler")
+            return
+        print(f"[FlightLoop] SCHED_FIFO priority {FLIGHT_RT_PRIORITY}")
+        # Keep every page resident so a page fault cannot stall a frame
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.mlockall(_MCL_CURRENT | _MCL_FUTURE) != 0:
+            print(f"[FlightLoop] Warning: mlockall failed: {os.strerror(ctypes.get_errno())}")
 
 
 def flight_loop(
@@ -35,8 +74,9 @@ def flight_loop(
     log_interval_frames: int = 40,
     slew_limit_override: float | None = None,
     signal_table: np.ndarray | None = None,
+    signal_table_spec: tuple | None = None,
     signal_sample_rate_hz: float | None = None,
-    param_queue=None,
+    live_params: bool = False,
 ) -> None: # type: ignore
     """
     Main flight control loop running at UPDATE_RATE_HZ.
@@ -50,7 +90,9 @@ def flight_loop(
     6. Maintains deterministic 2.5 ms loop timing
     
     Args:
-        stop_event: multiprocessing.Event to signal loop termination
+        stop_event: multiprocessing.Event set when the loop ends on its own
+            (duration reached); callers stop the loop through the shared
+            buffer's request_stop(), which is polled every tick without a lock
         use_mock_hardware: If True, use mock drivers; if False, use real drivers
         fourier_coeffs: Coefficient matrix [n_motors, n_terms] for signal generation
         base_freq: Base frequency for signal generation
@@ -60,23 +102,68 @@ def flight_loop(
         value_max: Maximum signal value
         enable_logging: If True, log data to CSV file
         log_interval_frames: Log every N frames (default 40 = 100ms at 400Hz, ~320ms at 125Hz)
+        signal_table_spec: share_ndarray() spec of a signal table held in shared
+            memory; used instead of signal_table so the table is not pickled
+        live_params: If True, attach to the GUI's ParameterBuffer and apply
+            parameter sets it publishes while running.  When fourier_coeffs
+            and signal_table are both omitted, the set already published
+            there is the initial one (coeffs, omega, phases and value_max).
     """
     print(f"[FlightLoop] Initializing at {UPDATE_RATE_HZ} Hz ({LOOP_TIME_MS:.2f} ms)")
-    
+    table_shm = None
+
     try:
+        _apply_realtime_policy()
+
         # Initialize hardware interface with platform detection
         hardware = HardwareInterface(use_mock=use_mock_hardware)
         
+        # Attach to shared memory buffers
+        shared_buffer = MotorStateBuffer(create=False)
+        param_buffer = ParameterBuffer(create=False) if live_params else None
+        param_seq = int(param_buffer.seq[0]) if param_buffer is not None else 0
+        
         # Initialize signal generator — Fourier synthesis or direct table playback
         _vmin = value_min if value_min is not None else SIGNAL_MIN_DEFAULT
         _vmax = value_max if value_max is not None else SIGNAL_MAX_DEFAULT
+        if signal_table is None and signal_table_spec is not None:
+            table_shm, signal_table = attach_ndarray(signal_table_spec)
+        if signal_table is None and fourier_coeffs is None and param_buffer is not None:
+            # Initial parameters were published to shared memory, not pickled
+            # Retried only if torn by a publish; a writer stuck mid-publish
+            # (odd seq) must not hang the worker, so give up after 1 s
+            _published = None
+            _read_deadline_ns = time.perf_counter_ns() + 1_000_000_000
+            while _published is None and param_seq:
+                _published = param_buffer.read(0)
+                if _published is None:
+                    if time.perf_counter_ns() > _read_deadline_ns:
+                        raise RuntimeError(
+                            "No consistent parameter set in shared memory after 1 s "
+                            f"(seq={int(param_buffer.seq[0])}); is the GUI still publishing?"
+                        )
+                    time.sleep(0.001)
+            if _published is not None:
+                param_seq, _initial = _published
+                fourier_coeffs = _initial['coeffs']
+                omega_per_motor = _initial['omega_per_motor']
+                phase_radians = _initial['phases']
+                _vmax = _initial['value_max']
         if signal_table is not None:
-            signal_gen = DirectSignalGenerator(
-                signal_table,
-                sample_rate_hz=signal_sample_rate_hz if signal_sample_rate_hz is not None else UPDATE_RATE_HZ,
-                value_min=_vmin,
-                value_max=_vmax,
-            )
+            try:
+                signal_gen = DirectSignalGenerator(
+                    signal_table,
+                    sample_rate_hz=signal_sample_rate_hz if signal_sample_rate_hz is not None else UPDATE_RATE_HZ,
+                    value_min=_vmin,
+                    value_max=_vmax,
+                )
+            finally:
+                if table_shm is not None:
+                    # DirectSignalGenerator keeps its own copy (or failed); drop
+                    # the view and the mapping either way. The GUI unlinks the segment.
+                    signal_table = None
+                    table_shm.close()
+                    table_shm = None
             print(f"[FlightLoop] Mode: Direct signal table "
                   f"({signal_gen.n_frames} frames @ {signal_gen.sample_rate_hz:.0f} Hz "
                   f"= {signal_gen.n_frames / signal_gen.sample_rate_hz:.2f} s)")
@@ -91,12 +178,18 @@ def flight_loop(
                 value_max=_vmax,
             )
             print(f"[FlightLoop] Mode: Fourier synthesis")
+            if signal_gen.wavetable_size:
+                # Parity against the WAVETABLE_SIZE=0 path; anything under one
+                # PWM microsecond of the normalised span is invisible to the ESCs
+                _table_error = signal_gen.wavetable_error()
+                print(f"[FlightLoop] Wavetable: {signal_gen.wavetable_size} samples/period, "
+                      f"max error vs direct synthesis {_table_error:.1e}")
+                if _table_error * _PWM_SPAN_F > 1.0:
+                    print(f"[FlightLoop] Warning: wavetable error exceeds 1 µs of PWM; "
+                          f"raise WAVETABLE_SIZE or set it to 0")
         else:
             raise ValueError("Provide either fourier_coeffs or signal_table to flight_loop")
         
-        # Attach to shared memory buffer
-        shared_buffer = MotorStateBuffer(create=False)
-        
         # CSV logging setup
         csv_file = None
         csv_writer = None
@@ -121,14 +214,15 @@ def flight_loop(
         # State tracking — seed from signal at t=0 so there is no forced ramp from PWM_CENTER
         _init_signal = signal_gen.get_flow_field(0.0)
         _init_pos = np.maximum(_init_signal, 0.0)
-        _init_active = PWM_MIN_RUNNING + _init_pos * (PWM_MAX - PWM_MIN_RUNNING)
+        _init_active = _PWM_RUNNING_F + _init_pos * _PWM_SPAN_F
         previous_pwm = np.where(
             _init_signal <= 0.0,
-            float(PWM_MIN),
+            _PWM_MIN_F,
             _init_active
         )
-        previous_pwm = np.clip(previous_pwm, PWM_MIN, PWM_MAX)
-        active_slew_limit = (slew_limit_override if slew_limit_override is not None else MAX_PWM_SLEW_LIMIT) * LOOP_TIME_MS
+        previous_pwm = np.clip(previous_pwm, _PWM_MIN_F, _PWM_MAX_F)
+        active_slew_limit = float(slew_limit_override if slew_limit_override is not None else MAX_PWM_SLEW_LIMIT) * LOOP_TIME_MS
+        neg_slew_limit = -active_slew_limit
         frame_count = 0
 
         # Warm-up flush: absorb any SPI-init garbage that entered the Pico's
@@ -147,19 +241,21 @@ def flight_loop(
         # After these two flushes the Pico's frame counter is guaranteed to be
         # at 0 regardless of how many phantom bytes arrived on SPI init.
         if not hardware.use_mock:
-            _idle_flush = np.full(NUM_MOTORS, float(PWM_MIN))
-            hardware.send_pwm(_idle_flush)
+            hardware.send_pwm(_IDLE_PWM)
             time.sleep(0.025)   # one ESC PWM cycle (20 ms) + 5 ms margin
-            hardware.send_pwm(_idle_flush)
+            hardware.send_pwm(_IDLE_PWM)
             time.sleep(0.025)
 
-        loop_start_time = time.perf_counter()
+        loop_start_ns = time.perf_counter_ns()
+        next_deadline_ns = loop_start_ns
+        overrun_count = 0
 
         print("[FlightLoop] Ready to begin control loop")
         
-        while not stop_event.is_set():
+        stop_flag = shared_buffer.stop_flag
+        while not stop_flag[0]:
             frame_count += 1
-            frame_time = time.perf_counter() - loop_start_time
+            frame_time = (time.perf_counter_ns() - loop_start_ns) * 1e-9
             
             # --- Step 1: Generate physics signal (0.0 to 1.0) ---
             signal_raw = signal_gen.get_flow_field(frame_time)
@@ -172,10 +268,10 @@ def flight_loop(
             #   signal >  0  →  PWM_MIN_RUNNING + signal × (PWM_MAX − PWM_MIN_RUNNING)
             # Example: signal=0.5, PWM_MIN_RUNNING=1000, PWM_MAX=2000 → 1500 µs
             _signal_pos = np.maximum(signal_raw, 0.0)
-            pwm_active = PWM_MIN_RUNNING + _signal_pos * (PWM_MAX - PWM_MIN_RUNNING)
+            pwm_active = _PWM_RUNNING_F + _signal_pos * _PWM_SPAN_F
             pwm_target = np.where(
                 signal_raw <= 0.0,
-                float(PWM_MIN),
+                _PWM_MIN_F,
                 pwm_active
             )
             
@@ -184,13 +280,13 @@ def flight_loop(
             pwm_delta = pwm_target - previous_pwm
             
             # Clamp delta to slew limit
-            pwm_delta_clamped = np.clip(pwm_delta, -active_slew_limit, active_slew_limit)
+            pwm_delta_clamped = np.clip(pwm_delta, neg_slew_limit, active_slew_limit)
             
             # Compute safe PWM
             pwm_safe = previous_pwm + pwm_delta_clamped
             
             # Final clamp to valid PWM range
-            pwm_safe = np.clip(pwm_safe, PWM_MIN, PWM_MAX)
+            pwm_safe = np.clip(pwm_safe, _PWM_MIN_F, _PWM_MAX_F)
             
             # --- Step 4: Send to hardware ---
             hardware.send_pwm(pwm_safe)
@@ -199,19 +295,20 @@ def flight_loop(
             shared_buffer.set_pwm(pwm_safe)
 
             # --- Step 5b: Apply live parameter updates from GUI ---
-            # Drain the queue and apply the most recent update (skip stale ones).
-            if param_queue is not None:
-                _update = None
-                while True:
-                    try:
-                        _update = param_queue.get_nowait()
-                    except Exception:
-                        break
-                if _update is not None:
-                    signal_gen.coeffs = _update['coeffs'].astype(np.float64)
-                    signal_gen.n_terms = signal_gen.coeffs.shape[1]
-                    signal_gen.omega_per_motor = _update['omega_per_motor'].astype(np.float64)
-                    signal_gen.phases = _update['phases'].astype(np.float64)
+            # Only the newest complete parameter set is visible (seqlock read).
+            # This runs after the frame has gone out, so the wavetable rebuild
+            # inside set_coefficients (~0.4 ms for 20 terms) is paid from this
+            # frame's sleep budget rather than delaying the SPI send; an update
+            # that still pushes past the deadline is counted in Step 8.
+            if param_buffer is not None:
+                _published = param_buffer.read(param_seq)
+                if _published is not None:
+                    param_seq, _update = _published
+                    signal_gen.set_coefficients(
+                        _update['coeffs'],
+                        _update['omega_per_motor'],
+                        _update['phases'],
+                    )
                     signal_gen.value_max = float(_update['value_max'])
 
             # --- Step 6: Log to CSV (if enabled) ---
@@ -233,26 +330,34 @@ def flight_loop(
             # Sleep for most of the remaining frame time to yield the CPU (avoids
             # 100% CPU usage which causes Windows thermal throttling and preemption).
             # Busy-wait only the last 0.5 ms for sub-millisecond timing accuracy.
-            target_time = loop_start_time + (frame_count * LOOP_TIME_MS / 1000.0)
-            sleep_until = target_time - 0.0005  # wake 0.5 ms early
-            remaining = sleep_until - time.perf_counter()
-            if remaining > 0:
-                time.sleep(remaining)
-            while time.perf_counter() < target_time:
+            # Deadlines are absolute integer nanoseconds, so there is no per-frame
+            # float conversion and no accumulated drift.
+            next_deadline_ns += LOOP_TIME_NS
+            now_ns = time.perf_counter_ns()
+            if now_ns > next_deadline_ns:
+                # Counted only: a print here could block on a piped stdout and
+                # make the next frame late too. Reported in the status line.
+                overrun_count += 1
+            remaining_ns = next_deadline_ns - 500_000 - now_ns  # wake 0.5 ms early
+            if remaining_ns > 0:
+                time.sleep(remaining_ns * 1e-9)
+            while time.perf_counter_ns() < next_deadline_ns:
                 pass  # short spinlock for final precision
 
             # --- Step 9: Self-terminate when duration_s elapsed ---
             if duration_s is not None and frame_time >= duration_s:
+                shared_buffer.request_stop()
                 stop_event.set()
             
             # Periodic status (every 100 frames = 250 ms at 400 Hz, 800 ms at 125 Hz)
             if frame_count % 100 == 0:
-                elapsed = time.perf_counter() - loop_start_time
+                elapsed = (time.perf_counter_ns() - loop_start_ns) * 1e-9
                 actual_rate = frame_count / elapsed if elapsed > 0 else 0
                 avg_pwm = pwm_safe.mean()
                 log_status = "(logging)" if enable_logging else "(no log)"
                 print(f"[FlightLoop] Frame {frame_count:6d} | "
-                      f"Rate: {actual_rate:.1f} Hz | Avg PWM: {avg_pwm:.0f} {log_status}")
+                      f"Rate: {actual_rate:.1f} Hz | Avg PWM: {avg_pwm:.0f} | "
+                      f"Overruns: {overrun_count} {log_status}")
     
     except Exception as e:
         print(f"[FlightLoop] FATAL ERROR: {e}")
@@ -267,10 +372,43 @@ def flight_loop(
             # Send a clean idle frame before releasing hardware so the Pico
             # sees 1000 µs as the last command (watchdog / heartbeat picks up after).
             try:
-                hardware.send_pwm(np.full(NUM_MOTORS, float(PWM_MIN)))
+                hardware.send_pwm(_IDLE_PWM)
             except Exception:
                 pass
             hardware.close()
         if 'shared_buffer' in locals():
             shared_buffer.close()
+        if locals().get('param_buffer') is not None:
+            param_buffer.close()
         print("[FlightLoop] Shutdown complete")
+
+
+def flight_worker(
+    commands: Queue,  # type: ignore
+    stop_event: Event,  # type: ignore
+    done_event: Event,  # type: ignore
+) -> None:
+    """
+    Long-lived flight process: runs flight_loop once per queued command.
+
+    Spawned once and reused across experiments, so the process start and the
+    module imports are paid only on the first run.
+
+    Args:
+        commands: Queue of flight_loop keyword-argument dicts (without
+            stop_event); None shuts the worker down
+        stop_event: Shared stop signal, cleared by the caller before each run
+        done_event: Set after every run, whether it finished or failed
+    """
+    print("[FlightWorker] Ready")
+    while True:
+        kwargs = commands.get()
+        if kwargs is None:
+            break
+        try:
+            flight_loop(stop_event, **kwargs)
+        except Exception:
+            traceback.print_exc()  # keep the worker alive for the next run
+        finally:
+            done_event.set()
+    print("[FlightWorker] Exiting")
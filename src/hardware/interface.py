@@ -3,6 +3,7 @@ Hardware Abstraction Layer for SPI motor control.
 Supports both real Raspberry Pi hardware and mock drivers for development.
 """
 
+import ctypes
 import platform
 import time
 from typing import List, Optional
@@ -28,16 +29,88 @@ PHYSICAL_MOTOR_ORDER = [
     # Pico 3 (byte positions 27-35): motors in physical order
     21, 22, 23, 27, 28, 29, 33, 34, 35
 ]
+_PHYSICAL_ORDER_INDEX = np.array(PHYSICAL_MOTOR_ORDER, dtype=np.intp)
+
+SYNC_PULSE_NS = 10_000  # SYNC high time that latches the frame on every Pico
+
+class _SpiIocTransfer(ctypes.Structure):
+    """struct spi_ioc_transfer from <linux/spi/spidev.h>."""
+    _fields_ = [
+        ("tx_buf", ctypes.c_uint64),
+        ("rx_buf", ctypes.c_uint64),
+        ("len", ctypes.c_uint32),
+        ("speed_hz", ctypes.c_uint32),
+        ("delay_usecs", ctypes.c_uint16),
+        ("bits_per_word", ctypes.c_uint8),
+        ("cs_change", ctypes.c_uint8),
+        ("tx_nbits", ctypes.c_uint8),
+        ("rx_nbits", ctypes.c_uint8),
+        ("word_delay_usecs", ctypes.c_uint8),
+        ("pad", ctypes.c_uint8),
+    ]
+
+
+def _spi_ioc_message(n: int) -> int:
+    """SPI_IOC_MESSAGE(n) request number: _IOW('k', 0, char[n * sizeof(spi_ioc_transfer)])."""
+    return (1 << 30) | ((n * ctypes.sizeof(_SpiIocTransfer)) << 16) | (ord('k') << 8)
+
+
+def _build_spi_message(frame_bytes: int, speed_hz: int):
+    """
+    TX buffer and spi_ioc_transfer descriptors for one frame of single-byte
+    transfers, with cs_change set between them so CS toggles around every byte.
+
+    Returns (tx, transfers); transfers is passed to ioctl as a mutable buffer.
+    """
+    tx = (ctypes.c_uint8 * frame_bytes)()
+    transfers = (_SpiIocTransfer * frame_bytes)()
+    tx_addr = ctypes.addressof(tx)
+    for i, transfer in enumerate(transfers):
+        transfer.tx_buf = tx_addr + i
+        transfer.len = 1
+        transfer.speed_hz = speed_hz
+        transfer.bits_per_word = 8
+        # On the last transfer cs_change would instead keep CS asserted
+        transfer.cs_change = 1 if i < frame_bytes - 1 else 0
+    return tx, transfers
+
+
+def _mock_ioctl(fd: int, request: int, arg) -> None:
+    """
+    Stand-in for fcntl.ioctl that enforces its argument contract, so MockSPI
+    catches a malformed SPI_IOC_MESSAGE call off-target: fcntl converts an
+    int argument to a C int (a 64-bit address overflows), so the descriptors
+    must go in as a writable buffer of exactly the size encoded in request.
+    """
+    if isinstance(arg, int):
+        if not -2**31 <= arg < 2**31:
+            raise OverflowError("signed integer is greater than maximum")
+        return
+    view = memoryview(arg)
+    if view.readonly:
+        raise TypeError("ioctl argument must be a mutable buffer")
+    size = (request >> 16) & 0x3FFF
+    if view.nbytes != size:
+        raise ValueError(f"ioctl buffer is {view.nbytes} bytes, request encodes {size}")
+
 
 class MockSPI:
     """Mock SPI for development/testing on non-Pi systems."""
     
-    def __init__(self):
+    def __init__(self, frame_bytes: int = len(PHYSICAL_MOTOR_ORDER)):
         self.frame_count = 0
+        # Same descriptors and ioctl call as RealSPI, against a checking stub
+        self._frame_bytes = frame_bytes
+        self._tx, self._transfers = _build_spi_message(frame_bytes, 1000000)
+        self._tx_view = np.frombuffer(self._tx, dtype=np.uint8)
+        self._request = _spi_ioc_message(frame_bytes)
     
     def write_bytes(self, data: List[int]) -> None:
         """Simulate SPI write operation."""
         self.frame_count += 1
+        if len(data) == self._frame_bytes:
+            self._tx_view[:] = data
+            _mock_ioctl(-1, self._request, self._transfers)
     
     def close(self) -> None:
         pass
@@ -57,19 +130,37 @@ class MockGPIO:
 class RealSPI:
     """Hardware SPI driver for Raspberry Pi (SPI0)."""
     
-    def __init__(self):
+    def __init__(self, frame_bytes: int = len(PHYSICAL_MOTOR_ORDER)):
+        import fcntl
         import spidev # type: ignore
         self.spi = spidev.SpiDev()
         self.spi.open(0, 0)  # SPI0, CE0
         self.spi.max_speed_hz = 1000000  # 1 MHz
         self.spi.mode = 0
         self.spi.bits_per_word = 8
+
+        # The Picos need CS toggled around every byte, so a frame is one
+        # SPI_IOC_MESSAGE of single-byte transfers with cs_change set between
+        # them: one ioctl per frame instead of one xfer2 per byte.  The
+        # transfer descriptors and TX buffer are built once and reused.
+        self._frame_bytes = frame_bytes
+        self._tx, self._transfers = _build_spi_message(frame_bytes, self.spi.max_speed_hz)
+        self._tx_view = np.frombuffer(self._tx, dtype=np.uint8)
+        self._ioctl = fcntl.ioctl
+        self._fd = self.spi.fileno()
+        self._request = _spi_ioc_message(frame_bytes)
         print("[SPI] Initialized SPI0 (GPIO10=MOSI, GPIO11=SCLK)")
     
     def write_bytes(self, data: List[int]) -> None:
         """Send bytes via SPI. Each byte triggers CS toggle for Pico sync."""
-        for b in data:
-            self.spi.xfer2([int(b) & 0xFF])
+        if len(data) != self._frame_bytes:
+            for b in data:
+                self.spi.xfer2([int(b) & 0xFF])
+            return
+        self._tx_view[:] = data
+        # The descriptor array goes in as a mutable buffer: an int argument is
+        # converted to a C int, which a 64-bit address overflows
+        self._ioctl(self._fd, self._request, self._transfers)
 
     def close(self) -> None:
         self.spi.close()
@@ -109,7 +200,11 @@ class RealGPIO:
     def toggle_sync_pin(self) -> None:
         """Send 10µs sync pulse to trigger PWM latch on all Picos."""
         self.line_request.set_value(self.sync_pin, self.Value.ACTIVE)
-        self.time.sleep(0.00001)  # 10 microsecond pulse
+        # Spin instead of time.sleep(10e-6), which wakes a scheduler tick late
+        # (often 50–100 µs) and makes the pulse width jitter frame to frame
+        pulse_end_ns = self.time.perf_counter_ns() + SYNC_PULSE_NS
+        while self.time.perf_counter_ns() < pulse_end_ns:
+            pass
         self.line_request.set_value(self.sync_pin, self.Value.INACTIVE)
 
 class HardwareInterface:
@@ -132,6 +227,9 @@ class HardwareInterface:
             self.use_mock = use_mock
             
         self.frames_sent = 0
+        # Per-frame scratch for send_pwm (physical order)
+        self._scaled = np.empty(len(PHYSICAL_MOTOR_ORDER))
+        self._packet = np.empty(len(PHYSICAL_MOTOR_ORDER), dtype=np.uint8)
         
         self._init_drivers()
         print(f"[HW] Ready. Mode: {'MOCK' if self.use_mock else 'REAL'}")
@@ -170,21 +268,21 @@ class HardwareInterface:
         self.frames_sent += 1
         
         # 1. Reorder motors to match physical wiring configuration
-        reordered_pwm = np.array([pwm_values[i] for i in PHYSICAL_MOTOR_ORDER])
+        reordered_pwm = np.take(pwm_values, _PHYSICAL_ORDER_INDEX)
         
-        # 2. Convert PWM values to byte values (0-255)
+        # 2. Convert PWM values to byte values (0-255), all motors at once
         #    0       → PWM_MIN (armed/stopped)
-        #    1–255   → PWM_MIN_RUNNING to PWM_MAX (spinning range)
+        #    1–255   → PWM_MIN_RUNNING to PWM_MAX (spinning range):
+        #              1 + floor((clip(pwm) - PWM_MIN_RUNNING) * 254 / range)
         _range = PWM_MAX - PWM_MIN_RUNNING
-        packet = []
-        for pwm in reordered_pwm:
-            if pwm < PWM_MIN_RUNNING or pwm <= PWM_MIN:
-                byte_val = 0x00
-            else:
-                clipped = max(PWM_MIN_RUNNING, min(PWM_MAX, pwm))
-                byte_val = 1 + int((clipped - PWM_MIN_RUNNING) * 254 / _range)
-                byte_val = max(1, min(255, byte_val))
-            packet.append(byte_val)
+        scaled = self._scaled
+        np.clip(reordered_pwm, PWM_MIN_RUNNING, PWM_MAX, out=scaled)
+        scaled -= PWM_MIN_RUNNING
+        scaled *= 254
+        scaled /= _range
+        packet = self._packet
+        np.add(scaled, 1, out=packet, casting='unsafe')  # float → uint8 truncates
+        packet[(reordered_pwm < PWM_MIN_RUNNING) | (reordered_pwm <= PWM_MIN)] = 0
 
         # 3. Send via SPI then trigger Sync atomically
         # Both are in one try block: if SPI fails, Sync is NOT triggered
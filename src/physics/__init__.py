@@ -1,13 +1,38 @@
 """Physics signal generation using Fourier series synthesis."""
 
+from functools import lru_cache
+
 import numpy as np
-from config import BASE_FREQUENCY, SIGNAL_MIN_DEFAULT, SIGNAL_MAX_DEFAULT
+from config import BASE_FREQUENCY, SIGNAL_MIN_DEFAULT, SIGNAL_MAX_DEFAULT, WAVETABLE_SIZE
+from src.physics._kernels import synth_fourier
+
+_TWO_PI = 2.0 * np.pi
+
+
+@lru_cache(maxsize=8)
+def _wavetable_basis(n_harmonics: int, size: int) -> np.ndarray:
+    """
+    Read-only [2 * n_harmonics, size + 1] basis: rows sin(nθ) then cos(nθ) for
+    n = 1..n_harmonics over θ = 2πk/size, k = 0..size.
+
+    Depends only on the shape, so it is computed once and shared by every
+    generator and every coefficient update.
+    """
+    orders = np.arange(1, n_harmonics + 1, dtype=np.float64)
+    angles = np.outer(orders, np.arange(size + 1) * (_TWO_PI / size))
+    basis = np.concatenate((np.sin(angles), np.cos(angles)))
+    basis.flags.writeable = False
+    return basis
 
 
 class SignalGenerator:
     """
     Reconstructs motor signals from pre-computed Fourier coefficients.
     Supports optional per-harmonic phase offsets and start-time delay.
+
+    By default each motor's waveform is rasterised over one period into a
+    wavetable whenever coefficients are loaded, and get_flow_field only
+    interpolates into it; pass wavetable_size=0 to synthesise every tick.
     """
     
     def __init__(
@@ -19,6 +44,7 @@ class SignalGenerator:
         start_time_offset: float = 0.0,
         value_min: float = SIGNAL_MIN_DEFAULT,
         value_max: float = SIGNAL_MAX_DEFAULT,
+        wavetable_size: int = WAVETABLE_SIZE,
     ):
         """
         Initialize the signal generator with coefficient and optional phase matrices.
@@ -30,29 +56,87 @@ class SignalGenerator:
             start_time_offset: Time (s) to delay waveform start (aligns with PWM start)
             value_min: Lower bound for normalized output (no remapping)
             value_max: Upper bound for normalized output (no remapping)
+            wavetable_size: Samples per period for wavetable playback (0 = direct synthesis);
+                rounded up to a power of two so lookups can wrap with a bitmask
+        """
+        self.base_freq = base_freq
+        size = max(0, int(wavetable_size))
+        self.wavetable_size = 1 << (size - 1).bit_length() if size else 0
+        self.omega = 2.0 * np.pi * base_freq
+        self.start_time_offset = max(0.0, float(start_time_offset))
+        self.value_min = float(value_min)
+        self.value_max = float(value_max)
+        if self.value_min > self.value_max:
+            self.value_min, self.value_max = self.value_max, self.value_min
+        self.set_coefficients(fourier_coeffs, omega_per_motor, phase_radians)
+
+    def set_coefficients(
+        self,
+        fourier_coeffs: np.ndarray,
+        omega_per_motor: np.ndarray | None = None,
+        phase_radians: np.ndarray | None = None,
+    ) -> None:
+        """
+        Load (or live-replace) the coefficient, omega and phase matrices.
+
+        Also rebuilds the per-harmonic tables used by get_flow_field, so callers
+        must go through this method rather than assigning self.coeffs directly.
         """
         self.coeffs = fourier_coeffs.astype(np.float64)
         self.n_motors = self.coeffs.shape[0]
         self.n_terms = self.coeffs.shape[1] if len(self.coeffs.shape) > 1 else 1
-        self.base_freq = base_freq
         self.omega_per_motor = None
         if omega_per_motor is not None:
             arr = np.array(omega_per_motor, dtype=np.float64)
             if arr.shape[0] != self.n_motors:
                 raise ValueError("omega_per_motor length must match number of motors")
             self.omega_per_motor = arr
-        self.omega = 2.0 * np.pi * base_freq
-        self.start_time_offset = max(0.0, float(start_time_offset))
-        self.value_min = float(value_min)
-        self.value_max = float(value_max)
-        if self.value_min > self.value_max:
-            self.value_min, self.value_max = self.value_max, self.value_min
         if phase_radians is None:
             self.phases = np.zeros_like(self.coeffs)
         else:
             self.phases = np.array(phase_radians, dtype=np.float64)
             if self.phases.shape != self.coeffs.shape:
                 raise ValueError("phase_radians must match fourier_coeffs shape")
+
+        # Harmonic orders 1..n_terms-1 and the matching coefficient/phase columns,
+        # laid out so every harmonic of every motor is evaluated in one broadcast.
+        self._orders = np.arange(1, self.n_terms, dtype=np.float64)
+        self._harmonic_coeffs = self.coeffs[:, 1:]
+        self._harmonic_phases = self.phases[:, 1:]
+        self._angles = np.empty((self.n_motors, self.n_terms - 1))
+
+        # Per-motor omega (flat for the compiled kernel, column for broadcasting)
+        self._omega_vec = (self.omega_per_motor if self.omega_per_motor is not None
+                           else np.full(self.n_motors, self.omega))
+        self._fundamental = np.empty((self.n_motors, 1))
+        self._signal = np.empty(self.n_motors)
+
+        self._wavetable = self._build_wavetable() if self.wavetable_size else None
+
+    def _build_wavetable(self) -> np.ndarray:
+        """
+        Rasterise one period of every motor's waveform (unclipped).
+
+        Returns [n_motors, wavetable_size + 1] float32 (half the cache footprint
+        of float64, still far finer than the 1 µs PWM step); column k holds the
+        signal at fundamental phase 2πk/size, and the extra last column repeats
+        column 0 so interpolation never wraps.
+        """
+        size = self.wavetable_size
+        # A·sin(nθ + φ) = (A·cos φ)·sin(nθ) + (A·sin φ)·cos(nθ): with the cached
+        # sin/cos basis the table is a single matrix product
+        basis = _wavetable_basis(self.n_terms - 1, size)
+        weights = np.concatenate((self._harmonic_coeffs * np.cos(self._harmonic_phases),
+                                  self._harmonic_coeffs * np.sin(self._harmonic_phases)), axis=1)
+        table = weights @ basis
+        table += self.coeffs[:, :1]
+        table = table.astype(np.float32)
+
+        self._samples_per_second = self._omega_vec * (size / _TWO_PI)
+        self._index_mask = size - 1
+        self._row_offsets = np.arange(self.n_motors) * (size + 1)
+        self._position = np.empty(self.n_motors)
+        return table
     
     def get_flow_field(self, t: float) -> np.ndarray:
         """
@@ -70,22 +154,68 @@ class SignalGenerator:
             Array of shape [n_motors] with values constrained to [value_min, value_max]
         """
         t_eff = max(0.0, t - self.start_time_offset)
-        
-        # Start with DC offset (coefficient 0)
-        signal = self.coeffs[:, 0].copy()
-        
-        # Add harmonic components (coefficients 1, 2, 3, ...)
-        for n in range(1, self.n_terms):
-            harmonic_order = n  # n=1 -> 1st harmonic, n=2 -> 2nd harmonic, etc.
-            if self.omega_per_motor is not None:
-                phase = harmonic_order * self.omega_per_motor * t_eff + self.phases[:, n]
-            else:
-                phase = harmonic_order * self.omega * t_eff + self.phases[:, n]
-            signal += self.coeffs[:, n] * np.sin(phase)
-        
+
+        if self._wavetable is not None:
+            signal = self._lookup_wavetable(t_eff)
+        else:
+            signal = self._synthesise(t_eff)
+
         # Constrain to requested range without remapping full span to [0,1]
         return np.clip(signal, self.value_min, self.value_max)
 
+    def wavetable_error(self, n_samples: int = 1024) -> float:
+        """
+        Largest deviation of wavetable playback from direct synthesis
+        (the wavetable_size=0 path) over one base period, before clipping.
+
+        Returns 0.0 when no wavetable is in use.
+        """
+        if self._wavetable is None:
+            return 0.0
+        period = _TWO_PI / self.omega
+        error = 0.0
+        for t_eff in np.linspace(0.0, period, n_samples):
+            diff = self._lookup_wavetable(t_eff) - self._synthesise(t_eff)
+            error = max(error, float(np.abs(diff).max()))
+        return error
+
+    def _synthesise(self, t_eff: float) -> np.ndarray:
+        """Evaluate the Fourier series directly at t_eff (unclipped)."""
+        if synth_fourier is not None:
+            synth_fourier(self.coeffs, self.phases, self._omega_vec, t_eff, self._signal)
+            return self._signal
+
+        # Fundamental phase ω_i * t wrapped to [0, 2π) before scaling by the
+        # harmonic order: exact for integer n, and keeps sin() arguments small
+        # however long the experiment runs.
+        fundamental = self._fundamental
+        np.multiply(self._omega_vec[:, np.newaxis], t_eff, out=fundamental)
+        np.remainder(fundamental, _TWO_PI, out=fundamental)
+
+        # angle[i, n] = n * (ω_i * t mod 2π) + phase[i, n] for all motors and harmonics at once
+        angles = self._angles
+        np.multiply(fundamental, self._orders, out=angles)
+        np.add(angles, self._harmonic_phases, out=angles)
+        np.sin(angles, out=angles)
+        np.multiply(angles, self._harmonic_coeffs, out=angles)
+
+        # DC offset (coefficient 0) plus the sum of harmonic components
+        return self.coeffs[:, 0] + angles.sum(axis=1)
+
+    def _lookup_wavetable(self, t_eff: float) -> np.ndarray:
+        """Linearly interpolate each motor's wavetable at its phase for t_eff (unclipped)."""
+        # Absolute sample position; the table size is a power of two, so the
+        # integer part wraps into one period with a mask instead of a float modulo
+        position = self._position
+        np.multiply(self._samples_per_second, t_eff, out=position)
+        index = position.astype(np.intp)
+        frac = position - index
+        index &= self._index_mask
+        index += self._row_offsets
+        flat = self._wavetable.ravel()
+        lo = flat.take(index)
+        return lo + (flat.take(index + 1) - lo) * frac
+
 
 class DirectSignalGenerator:
     """
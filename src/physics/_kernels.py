@@ -0,0 +1,47 @@
+"""
+Optional Numba-compiled kernels for the signal synthesis hot path.
+
+Numba is not a hard dependency.  When it is missing, every kernel name in
+this module is None and callers fall back to their NumPy implementation.
+"""
+
+import numpy as np
+
+_TWO_PI = 2.0 * np.pi
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def synth_fourier(coeffs, phases, omega, t_eff, out):
+        """
+        Fourier synthesis for all motors into `out` (no clipping).
+
+        out[i] = coeffs[i, 0] + sum_n coeffs[i, n] * sin(n * omega[i] * t_eff + phases[i, n])
+
+        omega[i] * t_eff is wrapped to [0, 2π) first so sin() arguments stay
+        small however long the run.
+
+        Args:
+            coeffs: [n_motors, n_terms] float64, C-contiguous
+            phases: [n_motors, n_terms] float64, C-contiguous
+            omega: [n_motors] float64 angular frequency per motor (rad/s)
+            t_eff: Effective time in seconds (start offset already removed)
+            out: [n_motors] float64 destination
+        """
+        n_motors, n_terms = coeffs.shape
+        for i in range(n_motors):
+            wt = (omega[i] * t_eff) % _TWO_PI
+            acc = coeffs[i, 0]
+            for n in range(1, n_terms):
+                acc += coeffs[i, n] * np.sin(n * wt + phases[i, n])
+            out[i] = acc
+        return out
+
+else:
+    synth_fourier = None
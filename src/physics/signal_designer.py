@@ -3,10 +3,28 @@ Signal design module for pre-computing Fourier coefficients.
 Generates coefficient matrices before flight loop starts.
 """
 
+from functools import lru_cache
+
 import numpy as np
 from config import NUM_MOTORS, FOURIER_TERMS, BASE_FREQUENCY
 
 
+@lru_cache(maxsize=None)
+def _square_wave_weights(n_terms: int) -> np.ndarray:
+    """
+    Unit-amplitude 50% duty square-wave harmonic weights, indexed by term.
+
+    weights[n] = 4 / (n * pi) for odd n, 0 for even n and the DC slot.
+    Read-only: the array is shared between callers.
+    """
+    orders = np.arange(n_terms)
+    weights = np.zeros(n_terms)
+    odd = orders % 2 == 1
+    weights[odd] = 4.0 / (orders[odd] * np.pi)
+    weights.flags.writeable = False
+    return weights
+
+
 def generate_square_pulse(
     n_motors: int = NUM_MOTORS,
     amplitude: float = 1.0,
@@ -41,18 +59,10 @@ def generate_square_pulse(
         coeffs[:, 1] = 1st harmonic amplitude
         coeffs[:, 2] = 2nd harmonic amplitude, etc.
     """
-    coeffs = np.zeros((n_motors, n_terms))
-    
-    # DC component - set to 0 here, GUI will set it to (high + low) / 2
-    coeffs[:, 0] = 0.0
-    
-    # For 50% duty cycle square wave: only odd harmonics contribute
-    # Formula: coefficient = (4 * amplitude) / (n * π) for odd n
-    for n in range(1, n_terms):
-        if n % 2 == 1:  # Odd harmonics only (1, 3, 5, 7, ...)
-            coeffs[:, n] = (4.0 * amplitude) / (n * np.pi)
-        else:  # Even harmonics are zero for 50% duty cycle
-            coeffs[:, n] = 0.0
+    # DC (column 0) stays 0 here - GUI will set it to (high + low) / 2.
+    # Harmonics: (4 * amplitude) / (n * π) for odd n, 0 for even n.
+    coeffs = np.empty((n_motors, n_terms))
+    np.multiply(amplitude, _square_wave_weights(n_terms), out=coeffs)
     
     return coeffs
 